@@ -0,0 +1,120 @@
+"""
+Write throughput and compression ratio of the zarr codecs accepted by
+``save_standardized_output(compression=...)``.
+
+Each recording is re-saved once per codec through the normal writer, into a
+temporary directory, and the size of its ``signals`` array is compared with
+the raw sample bytes. Inputs are standardized zarr outputs (``*.zarr`` or
+``*.zarr.zip``); raw-sample outputs (``signal_dtype="native"``) are re-saved
+raw, so the integer codecs (``+delta``) are measured on real ADC data.
+Without inputs a synthetic 32-channel, 30 kHz int16 recording is used.
+
+Usage::
+
+    python benchmarks/bench_codecs.py converted/*_std.zarr
+    python benchmarks/bench_codecs.py --codecs zstd:3 lz4 none --repeat 3
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import zarr
+
+from sparcfuse.utils import save_standardized_output
+
+DEFAULT_CODECS = (
+    "none",
+    "lz4",
+    "lz4:5:bitshuffle",
+    "zstd:1",
+    "zstd:5",
+    "zstd:5:bitshuffle",
+    "zstd:5:bitshuffle+delta",
+    "zlib:5",
+)
+
+
+# ── inputs ────────────────────────────────────────────────────────────
+def _synthetic_recording(n_channels=32, fs=30000.0, seconds=10.0, seed=0):
+    """Sine-modulated noise stored as int16 counts with an Intan-like gain."""
+    rng = np.random.default_rng(seed)
+    n = int(fs * seconds)
+    t = np.arange(n) / fs
+    lfp = 400 * np.sin(2 * np.pi * 8 * t)[None, :] * rng.uniform(0.5, 1.5, (n_channels, 1))
+    counts = np.clip(lfp + rng.normal(0, 60, (n_channels, n)), -32768, 32767).astype("i2")
+    return "synthetic", {
+        "signals": counts,
+        "sampling_frequency": fs,
+        "scale_factor": [0.195] * n_channels,
+        "add_offset": [0.0] * n_channels,
+    }
+
+
+def _load_recording(path):
+    """Signals of a standardized zarr output, as stored (raw samples stay raw)."""
+    path = Path(path)
+    store = zarr.ZipStore(str(path), mode="r") if path.suffix == ".zip" else str(path)
+    try:
+        root = zarr.open_group(store=store, mode="r")
+        sig = root["signals"]
+        result = {
+            "signals": sig[:],
+            "sampling_frequency": root.attrs.get("sampling_frequency"),
+        }
+        if "scale_factor" in sig.attrs:
+            result["scale_factor"] = sig.attrs["scale_factor"]
+            result["add_offset"] = sig.attrs.get("add_offset")
+    finally:
+        if isinstance(store, zarr.ZipStore):
+            store.close()
+    return path.name, result
+
+
+def _dir_bytes(path):
+    return sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file())
+
+
+# ── benchmark ─────────────────────────────────────────────────────────
+def bench(name, result, codecs, repeat=1):
+    raw_bytes = result["signals"].nbytes
+    print(f"\n{name}: {result['signals'].shape} {result['signals'].dtype}, "
+          f"{raw_bytes / 2**20:.1f} MiB of samples")
+    print(f"  {'codec':<26}{'write MiB/s':>12}{'ratio':>8}{'stored MiB':>12}")
+
+    for codec in codecs:
+        best = float("inf")
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "bench")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                save_standardized_output(
+                    out, result, {"format": "bench"},
+                    file_format="zarr", signal_dtype="native", compression=codec,
+                )
+                best = min(best, time.perf_counter() - start)
+            stored = _dir_bytes(out + ".zarr/signals")
+        print(f"  {codec:<26}{raw_bytes / 2**20 / best:>12.1f}"
+              f"{raw_bytes / max(stored, 1):>8.2f}{stored / 2**20:>12.1f}")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    p.add_argument("recordings", nargs="*", help="standardized .zarr / .zarr.zip outputs")
+    p.add_argument("--codecs", nargs="+", default=list(DEFAULT_CODECS),
+                   help="compression specs to compare")
+    p.add_argument("--repeat", type=int, default=1,
+                   help="writes per codec; the fastest is reported")
+    args = p.parse_args(argv)
+
+    inputs = [_load_recording(r) for r in args.recordings] or [_synthetic_recording()]
+    for name, result in inputs:
+        bench(name, result, args.codecs, max(1, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ descriptor = {
     "id": "csv_mapping_stretch_pressure",
     "sparc_id": 142,
     "format": ".csv",
+    "probe": {"columns": ["Time"]},
     "parser": {
         "module": "pandas",
         "function": "read_csv",
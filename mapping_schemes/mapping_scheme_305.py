@@ -2,6 +2,7 @@ descriptor = {
     "id": "csv_mapping_305",
     "sparc_id": 305,
     "format": ".csv",
+    "probe": {"columns": ["Stimulation Channel", "delta", "Stimulation Configuration"]},
     "parser": {
         "module": "pandas",
         "function": "read_csv",
@@ -39,6 +39,7 @@ descriptor = {
     "id": "matlab_mapping_302",
     "sparc_id": 309,
     "format": ".mat",
+    "probe": {"mat_vars": ["t_sim", "force"]},
     "parser": {
         "module": "scipy.io",
         "function": "loadmat",
@@ -38,6 +38,7 @@ descriptor = {
     "id": "matlab_mapping_310",
     "sparc_id": 310,
     "format": ".mat",
+    "probe": {"mat_vars": ["t", "v"]},
     "parser": {
         "module": "scipy.io",
         "function": "loadmat",
@@ -1,36 +1,10 @@
-# mapping_schemes/postprocess_intan_316.py
-import numpy as np
+from neo_rawio_chunked import make_rawio_stream
 
-def process_intan_rhd(reader, _=None):
-    reader.parse_header()
-
-    fs = reader.header["signal_channels"][0]["sampling_rate"]
-    n_samples = reader.get_signal_size(0, 0, 0)
-
-    sig = reader.get_analogsignal_chunk(
-        block_index=0, seg_index=0,
-        i_start=0, i_stop=n_samples,
-        stream_index=0                      # amplifier stream
-    )                                      # shape (n_samples, n_chan)
-
-    sig = sig.T                            #   → (n_chan, n_samples)
-    t   = np.arange(n_samples) / fs
-
-    return {
-        "time":               t,
-        "signals":            sig,
-        "sampling_frequency": fs,
-        "channel_names": [ch["name"] for ch in reader.header["signal_channels"]
-                          if ch["stream_id"] == "0"],
-        "channel_units": [ch["units"] for ch in reader.header["signal_channels"]
-                          if ch["stream_id"] == "0"],
-        "metadata": {
-            "experimenter": "Unknown",
-            "species":      "Rat",
-            "institution":  "CWRU"
-        },
-        "annotations": []
-    }
+stream_intan_rhd = make_rawio_stream(metadata={
+    "experimenter": "Unknown",
+    "species":      "Rat",
+    "institution":  "CWRU"
+})
 
 
 descriptor = {
@@ -42,7 +16,7 @@ descriptor = {
         "function":   "IntanRawIO",
         "args":       ["<filepath>"],
         "output_var": "reader",
-        "postprocess": process_intan_rhd
+        "stream":     stream_intan_rhd   # header now, blocks while saving
     },
     "mapping": {},                        # handled in post‑processor
     "validation": {
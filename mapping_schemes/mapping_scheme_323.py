@@ -2,6 +2,7 @@ descriptor = {
     "id": "mapping_scheme_323",
     "sparc_id": 323,
     "format": ".csv",
+    "probe": {"columns": ["Time"]},
     "parser": {
         "module": "pandas",
         "function": "read_csv",
@@ -2,6 +2,7 @@ descriptor = {
     "id": "matlab_mapping_rr_327",
     "sparc_id": 327,
     "format": ".mat",
+    "probe": {"mat_vars": ["timePlot05", "RRint05"]},
     "parser": {
         "module": "scipy.io",
         "function": "loadmat",
@@ -40,6 +40,7 @@ descriptor = {
     "id": "csv_mapping_350",
     "sparc_id": 350,
     "format": ".csv",
+    "probe": {"columns": ["TimeStamp(sec)"]},
 
     # -------------- loader ----------------------------------------------------
     "parser": {
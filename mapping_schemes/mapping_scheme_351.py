@@ -37,6 +37,7 @@ descriptor = {
     "id": "csv_mapping_351",
     "sparc_id": 351,
     "format": ".csv",
+    "probe": {"columns": ["TimeStamp(sec)"]},
 
     # -------------- loader ----------------------------------------------------
     "parser": {
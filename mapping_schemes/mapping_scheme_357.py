@@ -1,4 +1,4 @@
-from mapping_schemes.matlab_mapping_generic import process_matlab_generic
+from matlab_mapping_generic import process_matlab_generic
 
 descriptor = {
     "id":        "matlab_mapping_357",
@@ -56,6 +56,7 @@ descriptor = {
     "id":        "matlab_mapping_ecg_375",
     "sparc_id":  375,          # pick an unused SPARC‑ID in your set‑up
     "format":    ".mat",
+    "probe":    {"mat_vars": ["t", "ecg"]},
 
     "parser": {
         "module":      "scipy.io",
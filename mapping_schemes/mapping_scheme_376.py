@@ -56,6 +56,7 @@ descriptor = {
     "id":        "matlab_mapping_376",
     "sparc_id":  376,          # pick an unused SPARC‑ID in your set‑up
     "format":    ".mat",
+    "probe":    {"mat_vars": ["t", "emg"]},
 
     "parser": {
         "module":      "scipy.io",
@@ -84,6 +84,7 @@ descriptor = {
     "id":       "ep_hdf5_flat_mapping_391",
     "sparc_id": 391,
     "format":   ".hdf5",
+    "probe":   {"magic": b"\x89HDF\r\n\x1a\n", "hdf5_keys": ["EPs"]},
 
     "parser": {
         "module":     "h5py",
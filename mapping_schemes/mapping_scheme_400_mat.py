@@ -85,6 +85,7 @@ descriptor = {
     "id":       "neuroamp_mat_mapping_400",
     "sparc_id": 400,
     "format":   ".mat",
+    "probe":   {"mat_vars": ["data", "samplerate"]},
 
     "parser": {
         "module":      "mat73" if mat73 else "scipy.io",
@@ -47,6 +47,7 @@ descriptor = {
         "function":   "open",
         "args":       ["<filepath>"],
         "output_var": "file",
+        "close":      "os.close",   # os.open hands back a raw descriptor
         "postprocess": process_dat
     },
     "mapping": {},                        # handled in post‑processor
@@ -60,6 +60,7 @@ descriptor = {
     "id": "csv_mapping_425",
     "sparc_id": 425,
     "format": ".csv",
+    "probe": {"columns": ["subject", "time since start (s)", "bin duration (s)"]},
 
     # -------------- loader ----------------------------------------------------
     "parser": {
@@ -1,36 +1,10 @@
-# mapping_schemes/postprocess_intan_316.py
-import numpy as np
+from neo_rawio_chunked import make_rawio_stream
 
-def process_blackrock_ns5(reader, _=None):
-    reader.parse_header()
+stream_blackrock_ns5 = make_rawio_stream(metadata={
+    "experimenter": "",
+    "species":      "Cat",
+})
 
-    fs = reader.header["signal_channels"][0]["sampling_rate"]
-    n_samples = reader.get_signal_size(0, 0, 0)
-
-    sig = reader.get_analogsignal_chunk(
-        block_index=0, seg_index=0,
-        i_start=0, i_stop=n_samples,
-        stream_index=0                      # amplifier stream
-    )                                      # shape (n_samples, n_chan)
-
-    float_chunk = reader.rescale_signal_raw_to_float(sig, stream_index=0)
-    float_chunk = float_chunk.T
-
-    #sig = sig.T                            #   → (n_chan, n_samples)
-    t   = np.arange(n_samples) / fs
-
-    return {
-        "time":               t,
-        "signals":            float_chunk, #sig,
-        "sampling_frequency": fs,
-        "channel_names": [str(ch["name"]) for ch in reader.header["signal_channels"]],
-        "channel_units": [str(ch["units"]) for ch in reader.header["signal_channels"]],
-        "metadata": {
-            "experimenter": "",
-            "species":      "Cat",
-        },
-        "annotations": []
-    }
 
 descriptor = {
     "id":       "mapping_435",
@@ -41,7 +15,7 @@ descriptor = {
         "function":   "BlackrockRawIO",
         "args":       ["<filepath>"],
         "output_var": "reader",
-        "postprocess": process_blackrock_ns5
+        "stream":     stream_blackrock_ns5   # header now, blocks while saving
     },
     "mapping": {},                        # handled in post‑processor
     "validation": {
@@ -0,0 +1,96 @@
+import re
+
+BLOCK_SAMPLES = 65536                       # samples read at a time
+
+
+# ── helpers ───────────────────────────────────────────────────────────
+def _stream_channels(reader, stream_index):
+    stream_id = reader.header["signal_streams"][stream_index]["id"]
+    return [ch for ch in reader.header["signal_channels"] if ch["stream_id"] == stream_id]
+
+
+def _stream_key(name, taken):
+    """Zarr-safe, unique group name for a neo stream ("USB board ADC input channel" → …)."""
+    key = re.sub(r"[^\w.-]+", "_", str(name)).strip("_") or "stream"
+    base, i = key, 1
+    while key in taken:
+        i += 1
+        key = f"{base}_{i}"
+    return key
+
+
+def _segments(reader):
+    for block_index in range(reader.block_count()):
+        for seg_index in range(reader.segment_count(block_index)):
+            yield block_index, seg_index
+
+
+def iter_rawio_chunks(reader, stream_index=0, block_samples=BLOCK_SAMPLES):
+    """
+    Yield ``(t0, chunk)`` over every block/segment of one stream, reading
+    *block_samples* at a time; each chunk holds the raw samples in their
+    native dtype, shaped (n_chan, n_chunk) – `rawio_stream_header` gives the
+    per-channel gain/offset to rescale them. *t0* follows the segment's own
+    start time, so gaps between segments survive in the time axis.
+    """
+    fs = reader.get_signal_sampling_rate(stream_index)
+    for block_index, seg_index in _segments(reader):
+        n_samples = reader.get_signal_size(block_index, seg_index, stream_index)
+        t_start = reader.get_signal_t_start(block_index, seg_index, stream_index)
+        for i_start in range(0, n_samples, block_samples):
+            raw_chunk = reader.get_analogsignal_chunk(
+                block_index=block_index, seg_index=seg_index,
+                i_start=i_start, i_stop=min(i_start + block_samples, n_samples),
+                stream_index=stream_index
+            )                                  # shape (n_chunk, n_chan)
+            yield t_start + i_start / fs, raw_chunk.T   #   → (n_chan, n_chunk)
+
+
+def rawio_stream_header(reader, stream_index=0):
+    """
+    Sampling rate, channel names/units, total length (all segments) and the
+    per-channel ``scale_factor``/``add_offset`` (neo gain/offset) of one stream.
+    """
+    channels = _stream_channels(reader, stream_index)
+    return {
+        "sampling_frequency": float(reader.get_signal_sampling_rate(stream_index)),
+        "n_channels":    len(channels),
+        "n_samples":     sum(reader.get_signal_size(b, s, stream_index)
+                             for b, s in _segments(reader)),
+        "channel_names": [str(ch["name"]) for ch in channels],
+        "channel_units": [str(ch["units"]) for ch in channels],
+        "scale_factor":  [float(ch["gain"]) for ch in channels],
+        "add_offset":    [float(ch["offset"]) for ch in channels],
+    }
+
+
+# ── stream hook ───────────────────────────────────────────────────────
+def make_rawio_stream(metadata=None, stream_index=0, block_samples=BLOCK_SAMPLES):
+    """
+    Build a descriptor ``parser["stream"]`` hook for a neo.rawio reader.
+
+    Stream *stream_index* becomes the result's signals; every other stream
+    with signal channels is returned under ``"streams"`` (keyed by a
+    zarr-safe version of its neo name) and written alongside it.
+    """
+    def stream_rawio(reader, _=None):
+        reader.parse_header()
+
+        header = rawio_stream_header(reader, stream_index)
+        header["stream_name"] = str(reader.header["signal_streams"][stream_index]["name"])
+        header["metadata"] = dict(metadata or {})
+        header["annotations"] = []
+
+        extra = {}
+        for index, stream in enumerate(reader.header["signal_streams"]):
+            if index == stream_index or not _stream_channels(reader, index):
+                continue
+            key = _stream_key(stream["name"], extra)
+            extra[key] = dict(rawio_stream_header(reader, index),
+                              blocks=iter_rawio_chunks(reader, index, block_samples))
+        if extra:
+            header["streams"] = extra
+
+        return header, iter_rawio_chunks(reader, stream_index, block_samples)
+
+    return stream_rawio
@@ -14,13 +14,15 @@ import os
 import sys
 sys.path.insert(1, '..')
 
-#from utils import match_best_mapping, load_all_descriptors, save_standardized_output
+from utils import DescriptorRegistry, MappingCache, match_best_mapping, save_standardized_output
 
 
 from sparc_fuse_core import (get_sparc_datasets_by_id, list_primary_files,
                       print_project_metadata, 
                       download_and_move_sparc_file, list_sparc_datasets,
-                      download_and_convert_sparc_data)
+                      download_and_convert_sparc_data, fetch_sparc_file,
+                      fetch_dataset_metadata, index_dataset_files,
+                      RawFileCache)
 
 
 ### https://docs.pennsieve.io/reference/createdataset
@@ -48,7 +50,13 @@ CORS(app)
 DOWNLOAD_DIR = Path("../downloads")
 CONVERTED_DIR = Path("../converted")
 DESCRIPTOR_DIR = Path("../mapping_schemes")
-#DESCRIPTORS = load_all_descriptors(directory="../mapping_schemes")
+RAW_CACHE_DIR = Path("../raw_cache")
+RAW_CACHE_MAX_BYTES = 20 * 1024**3   # 20 GiB of raw downloads shared by all endpoints
+RAW_CACHE = RawFileCache(RAW_CACHE_DIR, max_bytes=RAW_CACHE_MAX_BYTES)
+DOWNLOAD_CHUNK_SIZE = 4 * 1024**2    # streamed to disk in 4 MiB pieces, never buffered whole
+CHUNK_BYTES = 4 * 1024**2            # target Zarr signals chunk size (override per request: "chunk_bytes")
+DESCRIPTORS = DescriptorRegistry(DESCRIPTOR_DIR)   # schemes are imported on first match
+MAPPING_CACHE = MappingCache(CONVERTED_DIR / "sparcfuse_mapping_cache.json")
 
 
 
@@ -82,19 +90,6 @@ def download_file(dataset_id, dataset_version, file_path, output_name=None):
     # payload = { "paths": ["files/primary/female/sub-1-2022-04-01/perf-1-2022-04-01-ST-MT/13-31-13-Amp-100-PW-300-Freq-020/PilotExpt26-220401-133140/PilotExpt26_220401_133140.rhd"] }
     
     src_format = file_path.split('.')[-1]
-    
-    json = {
-        "data": {
-            "paths": paths,
-            "datasetId": dataset_id,
-            "version": dataset_version,
-        }
-    }
-
-    # download the files with zipit service
-    url = "https://api.pennsieve.io/zipit/discover"
-    headers = {"content-type": "application/json"}
-    response = requests.post(url, json=json, headers=headers)
 
     # replace extension of the file with '.gz' if downloading more than 1 file
     if output_name is None and len(paths) > 1:
@@ -103,8 +98,21 @@ def download_file(dataset_id, dataset_version, file_path, output_name=None):
         output_name = f"download.{src_format}"
     
     output_file = Path(f"{DOWNLOAD_DIR}/{output_name}")
-    with open(output_file, mode="wb+") as f:
-        f.write(response.content)
+
+    # size/checksum from the (cached) dataset metadata, to verify the download
+    try:
+        metadata = fetch_dataset_metadata(dataset_id, dataset_version)
+        rel_path = file_path[len("files/"):] if file_path.startswith("files/") else file_path
+        file_record = index_dataset_files(metadata).get(rel_path)
+    except Exception as e:
+        print(f"Could not fetch metadata for dataset {dataset_id}: {e}")
+        file_record = None
+
+    # stream with the zipit service (resuming interrupted transfers),
+    # reusing earlier downloads of the same file
+    fetch_sparc_file(dataset_id, dataset_version, file_path, output_file,
+                     file_record=file_record, cache=RAW_CACHE,
+                     chunk_size=DOWNLOAD_CHUNK_SIZE)
 
     return output_file
 
@@ -116,13 +124,15 @@ def download_file(dataset_id, dataset_version, file_path, output_name=None):
     # with open("file.rhd", mode="wb+") as f:
     #     f.write(response.content)
 
-def convert_file(downloaded_file, src_path, src_filename, converted_path, dst_format="npz"):
+def convert_file(downloaded_file, src_path, src_filename, converted_path, dst_format="npz",
+                 signal_dtype="f8", chunk_bytes=CHUNK_BYTES, compression=None):
 
     # Load all descriptor files from folder
     
 
     # Optional: specify SPARC ID for faster mapping
-    result = match_best_mapping(DESCRIPTORS, downloaded_file, sparc_id=None)
+    result = match_best_mapping(DESCRIPTORS, downloaded_file, sparc_id=None, cache=MAPPING_CACHE,
+                                keep_open=True)
 
     # Check if mapping was successful
     if result["descriptor"] is None:
@@ -135,15 +145,19 @@ def convert_file(downloaded_file, src_path, src_filename, converted_path, dst_fo
 
     
 
-    save_standardized_output(
-        output_path=Path(f"{converted_path}/{src_filename.split('.')[0]}"),
-        result_dict=result["result"],
-        descriptor=result["descriptor"],
-        original_filename=src_filename.split(".")[0],  # Remove extension
-        annotations=result["result"].get("annotations", []),
-        metadata_overrides=None,
-        file_format=dst_format
-    )
+    with result["session"]:          # streamed signals are read from it while saving
+        save_standardized_output(
+            output_path=Path(f"{converted_path}/{src_filename.split('.')[0]}"),
+            result_dict=result["result"],
+            descriptor=result["descriptor"],
+            original_filename=src_filename.split(".")[0],  # Remove extension
+            annotations=result["result"].get("annotations", []),
+            metadata_overrides=None,
+            file_format=dst_format,
+            signal_dtype=signal_dtype,
+            chunk_bytes=chunk_bytes,
+            compression=compression,
+        )
 
     return Path(f"{converted_path}/{src_filename.split('.')[0]}.{dst_format}")
 
@@ -153,6 +167,9 @@ def convert():
     data = request.get_json()
     href = data["href"]
     dst_format = data["type"]
+    signal_dtype = data.get("signal_dtype", "f8")   # or "native": raw samples + scale/offset
+    chunk_bytes = int(data.get("chunk_bytes", CHUNK_BYTES))
+    compression = data.get("compression")           # e.g. "zstd:5:bitshuffle+delta"
 
     
     #https://sparc.science/datasets/file/436/1?path=files/primary/female/sub-1-2022-04-01/perf-1-2022-04-01-ST-MT/13-31-13-Amp-100-PW-300-Freq-020/PilotExpt26-220401-133140/PilotExpt26_220401_133140.rhd
@@ -178,7 +195,9 @@ def convert():
     print(f"src_path: {src_path}")
     print(f"src_filename: {src_filename}")
     print(f"converted_path: {converted_path}")
-    converted_file = convert_file(downloaded_file, src_path, src_filename, converted_path, dst_format=dst_format)
+    converted_file = convert_file(downloaded_file, src_path, src_filename, converted_path, dst_format=dst_format,
+                                  signal_dtype=signal_dtype, chunk_bytes=chunk_bytes,
+                                  compression=compression)
 
     #return send_file(converted_file, download_name=converted_name, as_attachment=True)
 
@@ -260,13 +279,21 @@ def download_and_convert_entire_dataset():
     path = data.get("path", None)
     dst_format = data["dst_format"]
     add_unsupported = data.get("add_unsupported", False)
+    signal_dtype = data.get("signal_dtype", "f8")
+    chunk_bytes = int(data.get("chunk_bytes", CHUNK_BYTES))
+    compression = data.get("compression")           # e.g. "zstd:5:bitshuffle+delta"
 
     result = download_and_convert_sparc_data(
         dataset_id,
         primary_paths=path,
         output_dir=CONVERTED_DIR, 
         file_format=dst_format,  # zarr or "zarr.zip",
-        descriptors_dir=DESCRIPTOR_DIR
+        descriptors_dir=DESCRIPTOR_DIR,
+        cache=RAW_CACHE,
+        mapping_cache=MAPPING_CACHE,
+        signal_dtype=signal_dtype,
+        chunk_bytes=chunk_bytes,
+        compression=compression,
     )
 
     unsupported_files = []
@@ -285,6 +312,7 @@ def download_and_convert_entire_dataset():
                     rel_path= r["rel_path"],
                     dataset_id=dataset_id,
                     output_dir=f"{CONVERTED_DIR}/" + "/".join(r["rel_path"].split('/')[:-1]),
+                    cache=RAW_CACHE,
                 )
                 result_paths.append(f"{CONVERTED_DIR}/{r['rel_path']}")
             except Exception as e:
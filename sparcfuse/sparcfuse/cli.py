@@ -14,12 +14,28 @@ Convert just two specific files::
 Write results somewhere else::
 
     sparc-fuse 224 --output-dir ~/data/converted
+
+Download 8 files at a time, converting them in 4 worker processes::
+
+    sparc-fuse 224 --workers 8 --convert-workers 4 --executor process
+
+Stage raw downloads on a scratch disk, keeping at least 10 GB free::
+
+    sparc-fuse 224 --scratch-dir /scratch --min-free 10000000000
+
+Pick up an interrupted conversion where it stopped::
+
+    sparc-fuse 224 --output-dir ~/data/converted --resume
+
+Keep raw ADC samples, delta-filtered and zstd-compressed::
+
+    sparc-fuse 436 --signal-dtype native --compression zstd:5:bitshuffle+delta
 """
 from __future__ import annotations
 
 import argparse
 from pathlib import Path
-from sparcfuse.sparc_fuse_core import download_and_convert_sparc_data
+from sparcfuse.sparc_fuse_core import RawFileCache, download_and_convert_sparc_data
 
 
 # ── ASCII banner ─────────────────────────────────────────────────────────
@@ -65,6 +81,140 @@ def _build_parser() -> argparse.ArgumentParser:
         help="Directory where converted files are saved",
     )
 
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of files downloaded/processed concurrently",
+    )
+
+    p.add_argument(
+        "--convert-workers",
+        type=int,
+        default=None,
+        help="Size of the conversion pool (defaults to --workers)",
+    )
+
+    p.add_argument(
+        "--executor",
+        choices=("thread", "process"),
+        default="thread",
+        help="Pool type used for the CPU-bound conversion stage",
+    )
+
+    p.add_argument(
+        "--prefetch",
+        type=int,
+        default=2,
+        help="Downloaded files allowed to queue up ahead of conversion",
+    )
+
+    p.add_argument(
+        "--scratch-dir",
+        type=Path,
+        default=None,
+        help="Where raw downloads are staged (defaults to the system temp dir)",
+    )
+
+    p.add_argument(
+        "--scratch-budget",
+        type=int,
+        default=None,
+        help="Maximum raw bytes held on the scratch disk at once",
+    )
+
+    p.add_argument(
+        "--min-free",
+        type=int,
+        default=0,
+        help="Pause downloads while the scratch filesystem has fewer free "
+             "bytes than this; fail a file when nothing else is left to wait "
+             "for (0 disables the check)",
+    )
+
+    p.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip files an earlier run already converted (see the manifest "
+             "in --output-dir) and retry only failed ones",
+    )
+
+    p.add_argument(
+        "--trust-legacy-outputs",
+        action="store_true",
+        help="Keep existing outputs that carry no source record (written by "
+             "older versions) instead of converting their files again",
+    )
+
+    p.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Keep raw downloads in this cache so later runs skip the download",
+    )
+
+    p.add_argument(
+        "--cache-max-bytes",
+        type=int,
+        default=None,
+        help="Size budget of the raw download cache (least recently used "
+             "files are evicted first)",
+    )
+
+    p.add_argument(
+        "--backend",
+        choices=("zipit", "s3"),
+        default="zipit",
+        help="Download through the Pennsieve zipit service or straight from "
+             "the requester-pays SPARC S3 mirror (needs AWS credentials)",
+    )
+
+    p.add_argument(
+        "--mapping-workers",
+        type=int,
+        default=1,
+        help="Try ambiguous mapping descriptors in this many worker "
+             "processes at once",
+    )
+
+    p.add_argument(
+        "--mapping-timeout",
+        type=float,
+        default=None,
+        help="Seconds a mapping descriptor may take before it is abandoned "
+             "(descriptors then run in worker processes)",
+    )
+
+    p.add_argument(
+        "--mapping-memory",
+        type=int,
+        default=None,
+        help="Resident memory in bytes a mapping descriptor may use before "
+             "it is abandoned",
+    )
+
+    p.add_argument(
+        "--signal-dtype",
+        default="f8",
+        help="Stored sample type (numpy dtype, e.g. f4, i2), or 'native' to keep "
+             "raw ADC samples with their per-channel scale/offset",
+    )
+
+    p.add_argument(
+        "--chunk-mib",
+        type=float,
+        default=4.0,
+        help="Target size in MiB of one Zarr signals chunk (time-major; "
+             "1-8 MiB suits both channel and time-window reads)",
+    )
+
+    p.add_argument(
+        "--compression",
+        default=None,
+        help="Zarr codec as <codec>[:<level>][:<shuffle>][+delta], e.g. "
+             "zstd:5:bitshuffle+delta, lz4, or none (default: zarr's Blosc lz4)",
+    )
+
     return p
 
 
@@ -86,6 +236,26 @@ def main(argv: list[str] | None = None) -> None:
             descriptors_dir=descriptors_dir,
             file_format=file_format,
             overwrite=overwrite,
+            trust_legacy_outputs=args.trust_legacy_outputs,
+            max_workers=args.workers,
+            convert_workers=args.convert_workers,
+            executor=args.executor,
+            prefetch=args.prefetch,
+            prefetch_bytes=args.scratch_budget,
+            scratch_dir=args.scratch_dir,
+            min_free_bytes=args.min_free,
+            resume=args.resume,
+            cache=(
+                RawFileCache(args.cache_dir, max_bytes=args.cache_max_bytes)
+                if args.cache_dir else None
+            ),
+            backend=args.backend,
+            mapping_workers=args.mapping_workers,
+            mapping_timeout=args.mapping_timeout,
+            mapping_memory_limit=args.mapping_memory,
+            signal_dtype=args.signal_dtype,
+            chunk_bytes=int(args.chunk_mib * 2**20),
+            compression=args.compression,
         )
     except Exception as exc:  # noqa: BLE001
         parser.error(str(exc))  # prints message + exits status-1
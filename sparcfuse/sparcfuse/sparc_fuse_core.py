@@ -1,5 +1,6 @@
 # ── standard library ────────────────────────────────────────────────────────
 from __future__ import annotations 
+import hashlib
 import json
 import os
 import shutil
@@ -7,13 +8,18 @@ import subprocess
 from collections import Counter, defaultdict
 from pathlib import Path
 from urllib.parse import quote
+import queue
 import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 
 # ── third-party ─────────────────────────────────────────────────────────────
 import imageio.v3 as iio
 import matplotlib.pyplot as plt
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 import tifffile
 import zarr
 from nd2reader import ND2Reader
@@ -25,8 +31,12 @@ from datetime import datetime
 
 # ── project-specific / local ────────────────────────────────────────────────
 from sparcfuse.utils import (
-    load_all_descriptors,
+    DescriptorRegistry,
+    MappingCache,
+    _mp_context,
     match_best_mapping,
+    open_signals,
+    open_time,
     save_standardized_output,
 )
 from sparc.client import SparcClient
@@ -34,12 +44,82 @@ from sparc.client import SparcClient
 
 client = SparcClient(connect=False, config_file='config.ini')
 
-def fetch_dataset_metadata(dataset_id):
+DISCOVER_API_URL = "https://api.pennsieve.io/discover"
+
+# dataset metadata is cached in-process and on disk; entries younger than
+# METADATA_TTL seconds are used as-is, older ones are revalidated with
+# If-None-Match / If-Modified-Since
+METADATA_TTL = 3600
+METADATA_CACHE_DIR = Path(
+    os.environ.get("SPARCFUSE_METADATA_CACHE", "~/.cache/sparcfuse/metadata")
+).expanduser()
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+_METADATA_MEMO: dict = {}            # (dataset_id, version) -> cache entry
+_METADATA_LOCKS: dict = {}           # (dataset_id, version) -> lock held while fetching it
+_METADATA_LOCK = threading.Lock()    # guards _METADATA_LOCKS
+
+
+def discover_session() -> requests.Session:
+    """
+    Returns the process-wide `requests.Session` used for Pennsieve API calls,
+    so connections are pooled and reused (also across download threads).
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def _metadata_lock(key) -> threading.Lock:
+    """Lock of one (dataset_id, version): its fetches run one at a time, other datasets' concurrently."""
+    with _METADATA_LOCK:
+        return _METADATA_LOCKS.setdefault(key, threading.Lock())
+
+
+def _read_metadata_cache(path: Path) -> dict | None:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _write_metadata_cache(path: Path, entry: dict) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(entry, fh)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[WARN] Could not write metadata cache {path}: {e}")
+
+
+def fetch_dataset_metadata(dataset_id, version=1, *, ttl=METADATA_TTL,
+                           cache_dir=METADATA_CACHE_DIR, refresh=False):
     """
     Fetches metadata for a specified dataset from the Pennsieve Discover API.
+
+    Responses are memoized in-process and, unless *cache_dir* is None, stored on
+    disk. Cached metadata younger than *ttl* seconds is returned without a request;
+    older entries are revalidated with a conditional GET (ETag / Last-Modified),
+    so an unchanged dataset costs a 304 instead of the full JSON.
     
     Args:
         dataset_id (str or int): The unique identifier of the dataset to fetch metadata for.
+        version (str or int, optional): Published dataset version. Defaults to 1.
+        ttl (float, optional): Seconds a cached response is trusted without revalidation.
+            Defaults to METADATA_TTL.
+        cache_dir (str or Path, optional): Directory of the on-disk cache, None to disable it.
+            Defaults to METADATA_CACHE_DIR (overridable with $SPARCFUSE_METADATA_CACHE).
+        refresh (bool, optional): Ignore the TTL and revalidate now. Defaults to False.
     
     Returns:
         dict: The metadata of the specified dataset as returned by the API.
@@ -47,17 +127,52 @@ def fetch_dataset_metadata(dataset_id):
     Raises:
         requests.HTTPError: If the HTTP request to the API fails.
     """
-    metadata_url = f"https://api.pennsieve.io/discover/datasets/{dataset_id}/versions/1/metadata"
-    resp = requests.get(metadata_url)
-    resp.raise_for_status()
-    return resp.json()
+    key = (str(dataset_id), str(version))
+    disk_path = (
+        Path(cache_dir).expanduser() / f"dataset_{dataset_id}_v{version}.json"
+        if cache_dir is not None else None
+    )
 
-def list_primary_files(dataset_id):
+    with _metadata_lock(key):
+        entry = _METADATA_MEMO.get(key)
+        if entry is None and disk_path is not None:
+            entry = _read_metadata_cache(disk_path)
+        if entry is not None and not refresh and time.time() - entry["fetched_at"] < ttl:
+            _METADATA_MEMO[key] = entry
+            return entry["metadata"]
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        metadata_url = f"{DISCOVER_API_URL}/datasets/{dataset_id}/versions/{version}/metadata"
+        resp = discover_session().get(metadata_url, headers=headers, timeout=60)
+        if resp.status_code == 304 and entry is not None:
+            entry["fetched_at"] = time.time()
+        else:
+            resp.raise_for_status()
+            entry = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+                "metadata": resp.json(),
+            }
+
+        _METADATA_MEMO[key] = entry
+        if disk_path is not None:
+            _write_metadata_cache(disk_path, entry)
+        return entry["metadata"]
+
+def list_primary_files(dataset_id, metadata=None):
     """
     Retrieve primary files from a dataset's metadata.
     
     Args:
         dataset_id (str): The unique identifier of the dataset.
+        metadata (dict, optional): Already fetched dataset metadata; fetched if omitted.
    
      Returns:
         tuple: A tuple containing:
@@ -67,13 +182,48 @@ def list_primary_files(dataset_id):
     Raises:
         Any exceptions raised by fetch_dataset_metadata.
     """
-    metadata = fetch_dataset_metadata(dataset_id)
+    if metadata is None:
+        metadata = fetch_dataset_metadata(dataset_id)
     primary_files = [
         f for f in metadata.get("files", [])
         if f.get("path", "").startswith("files/primary/")
     ]
     return primary_files, metadata
 
+def index_dataset_files(metadata):
+    """
+    Builds a lookup of a dataset's files from its metadata, in one pass.
+
+    Args:
+        metadata (dict): Dataset metadata as returned by fetch_dataset_metadata.
+
+    Returns:
+        dict: Maps each file's path below 'files/' (e.g. 'primary/sub-1/x.rhd') to its
+            metadata record (name, path, size, s3VersionId, …).
+    """
+    index = {}
+    for f in metadata.get("files", []):
+        path = f.get("path", "")
+        index[path[len("files/"):] if path.startswith("files/") else path] = f
+    return index
+
+
+def _dataset_rel_path(rel_path: str) -> str:
+    """Normalise a user-supplied primary path to 'primary/...'."""
+    return rel_path if rel_path.startswith("primary/") else f"primary/{rel_path}"
+
+
+def _resolve_with_list_files(dataset_id, query_path: str) -> dict:
+    """
+    Fallback for files missing from the metadata: ask the Pennsieve search,
+    accepting only an exact path match (the query is fuzzy).
+    """
+    files = client.pennsieve.list_files(dataset_id=dataset_id, query=query_path)
+    for f in files or []:
+        if f.get("path") == query_path:
+            return f
+    raise FileNotFoundError(f"No matching file for {query_path}")
+
 def print_project_metadata(metadata):
     """
     Prints the 'item' field from the provided metadata dictionary in a formatted JSON structure.
@@ -87,26 +237,499 @@ def print_project_metadata(metadata):
     project = metadata.get("item", {})
     print(json.dumps(project, indent=2))
 
-def download_and_move_sparc_file(rel_path, dataset_id, output_dir):
+ZIPIT_URL = "https://api.pennsieve.io/zipit/discover"
+
+# bytes per streamed read/write; large enough to keep syscalls cheap, small
+# enough that a multi-GB recording never sits in memory
+DOWNLOAD_CHUNK_SIZE = int(os.environ.get("SPARCFUSE_DOWNLOAD_CHUNK_SIZE", 1 << 20))
+
+# transient errors a download is resumed after (via a Range request)
+_RETRYABLE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.Timeout,
+)
+
+
+def _expected_digest(file_record: dict | None):
+    """
+    (algorithm, hexdigest) of a metadata file record whose checksum names a
+    hashlib algorithm, else None (e.g. records that only carry an S3 version id).
+    """
+    checksum = (file_record or {}).get("checksum")
+    if not isinstance(checksum, dict):
+        return None
+    algorithm = str(checksum.get("algorithm", "")).lower().replace("-", "")
+    digest    = checksum.get("checksum") or checksum.get("value")
+    if not digest or algorithm not in hashlib.algorithms_available:
+        return None
+    return algorithm, str(digest).lower()
+
+
+def _verify_download(path: Path, expected_size=None, expected_digest=None, name=None) -> None:
+    """Raise RuntimeError if *path* does not match the size/digest from the metadata."""
+    name = name or path.name
+    if expected_size is not None:
+        size = path.stat().st_size
+        if size != expected_size:
+            raise RuntimeError(
+                f"Download of {name} is incomplete: {size} of {expected_size} bytes"
+            )
+    if expected_digest is not None:
+        algorithm, digest = expected_digest
+        h = hashlib.new(algorithm)
+        with open(path, "rb") as fh:
+            for block in iter(lambda: fh.read(DOWNLOAD_CHUNK_SIZE), b""):
+                h.update(block)
+        if h.hexdigest() != digest:
+            raise RuntimeError(f"{algorithm} checksum mismatch for {name}")
+
+
+def download_sparc_file(
+    dataset_id,
+    dataset_version,
+    file_path,
+    dest,
+    *,
+    chunk_size=None,
+    timeout=60,
+    retries=3,
+    expected_size=None,
+    expected_digest=None,
+):
+    """
+    Streams a single file of a published SPARC dataset into *dest*.
+
+    Unlike `client.pennsieve.download_file`, which always writes into the
+    current working directory, the destination is explicit, so concurrent
+    downloads (threads, parallel server requests) never interfere. The body is
+    written in *chunk_size* pieces and never held in memory as a whole.
+
+    When writing to a path, data goes to a '.part' sibling that survives
+    failures: an interrupted transfer (here, after a retryable network error,
+    or in a later call) continues with an HTTP Range request from the bytes
+    already on disk. Servers that ignore the Range header simply restart the
+    file. Once complete, the file is checked against *expected_size* and
+    *expected_digest* before it is renamed into place.
+
+    Args:
+        dataset_id (str or int): The identifier of the SPARC dataset.
+        dataset_version (str or int): The published version of the dataset.
+        file_path (str): Path of the file inside the dataset, e.g. 'files/primary/...'.
+        dest (str, Path or binary file object): Target file path, or an open handle to write into
+            (handles are neither resumed nor verified).
+        chunk_size (int, optional): Bytes per streamed chunk. Defaults to DOWNLOAD_CHUNK_SIZE
+            (1 MiB, overridable with $SPARCFUSE_DOWNLOAD_CHUNK_SIZE).
+        timeout (float, optional): Connect/read timeout in seconds. Defaults to 60.
+        retries (int, optional): Resume attempts after transient network errors. Defaults to 3.
+        expected_size (int, optional): Size in bytes from the dataset metadata.
+        expected_digest (tuple, optional): (hashlib algorithm, hex digest) from the dataset metadata.
+
+    Returns:
+        Path or file object: *dest* as a Path, or the handle that was written to.
+
+    Raises:
+        requests.HTTPError: If the download request fails.
+        RuntimeError: If the downloaded file does not match the expected size or checksum.
+    """
+    chunk_size = chunk_size or DOWNLOAD_CHUNK_SIZE
+    payload = {
+        "data": {
+            "paths": [file_path],
+            "datasetId": dataset_id,
+            "version": dataset_version,
+        }
+    }
+    session = discover_session()
+
+    if hasattr(dest, "write"):
+        with session.post(ZIPIT_URL, json=payload, stream=True, timeout=timeout) as resp:
+            resp.raise_for_status()
+            for chunk in resp.iter_content(chunk_size=chunk_size):
+                dest.write(chunk)
+        return dest
+
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    part = dest.with_name(dest.name + ".part")
+
+    for attempt in range(retries + 1):
+        offset  = part.stat().st_size if part.exists() else 0
+        if expected_size is not None and offset >= expected_size:
+            break                            # already complete
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            with session.post(ZIPIT_URL, json=payload, headers=headers,
+                              stream=True, timeout=timeout) as resp:
+                if offset and resp.status_code == 416:
+                    break                    # nothing left to send – .part is complete
+                resp.raise_for_status()
+                resumed = offset and resp.status_code == 206
+                with open(part, "ab" if resumed else "wb") as fh:
+                    for chunk in resp.iter_content(chunk_size=chunk_size):
+                        fh.write(chunk)
+            break
+        except _RETRYABLE_ERRORS as e:
+            if attempt == retries:
+                raise
+            print(f"[WARN] Download of {file_path} interrupted ({e}), resuming…")
+
+    try:
+        _verify_download(part, expected_size, expected_digest, name=dest.name)
+    except RuntimeError:
+        part.unlink()                        # corrupt – never resume from it
+        raise
+    os.replace(part, dest)
+    return dest
+
+
+class ZipitBackend:
+    """Download backend streaming files through the Pennsieve zipit service."""
+
+    name = "zipit"
+
+    def __init__(self, chunk_size=None):
+        self.chunk_size = chunk_size
+
+    def download(self, dataset_id, dataset_version, file_path, dest, *, file_record=None):
+        return download_sparc_file(
+            dataset_id, dataset_version, file_path, dest,
+            chunk_size=self.chunk_size,
+            expected_size=(file_record or {}).get("size"),
+            expected_digest=_expected_digest(file_record),
+        )
+
+
+# public, requester-pays mirror of every published SPARC dataset
+SPARC_S3_BUCKET = "pennsieve-prod-discover-publish-use1"
+
+
+class S3Backend:
+    """
+    Download backend reading files straight from the SPARC S3 mirror.
+
+    Objects live at ``s3://<bucket>/<dataset_id>/files/...``; the object version
+    recorded in the dataset metadata (``s3VersionId``) pins the published file.
+    Large files are fetched as *part_size* byte ranges by *max_concurrency*
+    parallel GETs and written into place, so a single file can use the full
+    bandwidth. As with `download_sparc_file`, data goes to a '.part' sibling
+    that survives failures; the ranges already written are logged next to it
+    ('.part.ranges'), so a later call for the same object version fetches
+    only the missing ones. The bucket is requester-pays: AWS credentials are
+    needed and transfer is billed to them.
+
+    Point *endpoint_url* (or $SPARCFUSE_S3_ENDPOINT) at a local S3 stand-in
+    such as moto or MinIO to exercise the backend without AWS.
+
+    Args:
+        bucket (str, optional): Bucket holding the datasets. Defaults to SPARC_S3_BUCKET.
+        requester_pays (bool, optional): Send the requester-pays header. Defaults to True.
+        endpoint_url (str, optional): Alternative S3 endpoint. Defaults to $SPARCFUSE_S3_ENDPOINT.
+        part_size (int, optional): Bytes per ranged GET. Defaults to 16 MiB.
+        max_concurrency (int, optional): Parallel ranged GETs per file. Defaults to 8.
+        fs (s3fs.S3FileSystem, optional): Pre-configured filesystem (overrides the above).
+    """
+
+    name = "s3"
+
+    def __init__(self, bucket=SPARC_S3_BUCKET, *, requester_pays=True, endpoint_url=None,
+                 part_size=16 * 1024**2, max_concurrency=8, fs=None):
+        self.bucket          = bucket
+        self.part_size       = part_size
+        self.max_concurrency = max(1, int(max_concurrency))
+        endpoint_url         = endpoint_url or os.environ.get("SPARCFUSE_S3_ENDPOINT")
+        self.fs = fs or s3fs.S3FileSystem(
+            requester_pays=requester_pays,
+            version_aware=True,
+            client_kwargs={"endpoint_url": endpoint_url} if endpoint_url else None,
+        )
+
+    def download(self, dataset_id, dataset_version, file_path, dest, *, file_record=None):
+        file_record = file_record or {}
+        key        = f"{self.bucket}/{dataset_id}/{file_path}"
+        version_id = file_record.get("s3VersionId")
+        size       = file_record.get("size")
+        if size is None:
+            size = self.fs.info(key, version_id=version_id)["size"]
+
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part   = dest.with_name(dest.name + ".part")
+        log    = dest.with_name(dest.name + ".part.ranges")   # starts of the ranges in .part
+        stamp  = f"{version_id} {size} {self.part_size}"
+        done   = self._written_ranges(part, log, stamp, size)
+        ranges = [(start, min(start + self.part_size, size))
+                  for start in range(0, size, self.part_size) if start not in done]
+        lock = threading.Lock()
+
+        if not done:                         # fresh transfer
+            with open(part, "wb") as fh:
+                fh.truncate(size)
+            log.write_text(stamp + "\n", encoding="utf-8")
+
+        def _fetch(rng, fh, log_fh):
+            start, end = rng
+            data = self.fs.cat_file(key, start=start, end=end, version_id=version_id)
+            with lock:
+                fh.seek(start)
+                fh.write(data)
+                fh.flush()                   # data first, then its log line
+                log_fh.write(f"{start}\n")
+                log_fh.flush()
+
+        with open(part, "r+b") as fh, open(log, "a", encoding="utf-8") as log_fh:
+            if len(ranges) <= 1:
+                for rng in ranges:
+                    _fetch(rng, fh, log_fh)
+            else:
+                with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                    list(pool.map(lambda rng: _fetch(rng, fh, log_fh), ranges))
+
+        try:
+            _verify_download(part, file_record.get("size"), _expected_digest(file_record),
+                             name=dest.name)
+        except RuntimeError:
+            part.unlink()                    # corrupt – never resume from it
+            log.unlink(missing_ok=True)
+            raise
+        os.replace(part, dest)
+        log.unlink(missing_ok=True)
+        return dest
+
+    @staticmethod
+    def _written_ranges(part: Path, log: Path, stamp: str, size: int) -> set:
+        """
+        Starts of the ranges an earlier call already wrote to *part*, if it was
+        fetching the same object version in the same ranges (*stamp*).
+        """
+        try:
+            lines = log.read_text(encoding="utf-8").split("\n")[:-1]   # drop a torn last line
+            if not lines or lines[0] != stamp or part.stat().st_size != size:
+                return set()
+            return {int(line) for line in lines[1:] if line.isdigit()}
+        except OSError:
+            return set()
+
+
+# selectable per run via download_and_convert_sparc_data(backend=...)
+DOWNLOAD_BACKENDS = {
+    ZipitBackend.name: ZipitBackend,
+    S3Backend.name: S3Backend,
+}
+
+
+def _as_backend(backend):
+    """Accept a backend instance, a name from DOWNLOAD_BACKENDS or None (zipit)."""
+    if backend is None:
+        return ZipitBackend()
+    if isinstance(backend, str):
+        try:
+            return DOWNLOAD_BACKENDS[backend]()
+        except KeyError:
+            raise ValueError(
+                f"Unknown download backend '{backend}' (expected one of {sorted(DOWNLOAD_BACKENDS)})"
+            ) from None
+    return backend
+
+
+class RawFileCache:
+    """
+    Size-bounded on-disk cache of raw SPARC downloads with LRU eviction.
+
+    Entries are keyed by dataset id, dataset version and file path (published
+    versions are immutable); the source checksum, when known, is stored with
+    the entry and a mismatch is treated as a miss. Each entry lives in its own
+    directory and keeps the original file name::
+
+        <cache_dir>/<sha1(id/version/path)>/<file name>
+        <cache_dir>/<sha1(id/version/path)>/entry.json
+
+    Reading an entry refreshes its modification time, which is what eviction
+    orders by once the cache grows beyond *max_bytes*.
+
+    Args:
+        cache_dir (str or Path): Directory holding the cache (created if missing).
+        max_bytes (int, optional): Size budget in bytes. None means unbounded.
+    """
+
+    def __init__(self, cache_dir, max_bytes=None):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock     = threading.RLock()
+
+    def _entry_dir(self, dataset_id, dataset_version, path) -> Path:
+        key = hashlib.sha1(f"{dataset_id}/{dataset_version}/{path}".encode()).hexdigest()
+        return self.cache_dir / key
+
+    def get(self, dataset_id, dataset_version, path, checksum=None) -> Path | None:
+        """Return the cached file, or None on a miss."""
+        entry_dir = self._entry_dir(dataset_id, dataset_version, path)
+        cached    = entry_dir / os.path.basename(path)
+        try:
+            with open(entry_dir / "entry.json", "r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not cached.exists():
+            return None
+        if checksum is not None and entry.get("checksum") not in (None, checksum):
+            return None
+        os.utime(cached)                     # mark as recently used
+        return cached
+
+    def put(self, dataset_id, dataset_version, path, download, checksum=None, dest=None) -> Path:
+        """
+        Download a file into the cache via ``download(dest_path)`` and return
+        its cached location. With *dest*, the file is also materialised there
+        (see `fetch`) before the entry becomes visible to a concurrent eviction.
+        Evicts least-recently-used entries afterwards.
+        """
+        entry_dir = self._entry_dir(dataset_id, dataset_version, path)
+        staging   = Path(tempfile.mkdtemp(prefix=".staging-", dir=self.cache_dir))
+        try:
+            target = staging / os.path.basename(path)
+            download(target)
+            with open(staging / "entry.json", "w", encoding="utf-8") as fh:
+                json.dump({
+                    "dataset_id": dataset_id,
+                    "dataset_version": dataset_version,
+                    "path": path,
+                    "checksum": checksum,
+                    "size": target.stat().st_size,
+                }, fh)
+            with self._lock:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                os.replace(staging, entry_dir)
+                cached = entry_dir / os.path.basename(path)
+                if dest is not None:
+                    self._materialise(cached, Path(dest))
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict(keep=entry_dir)
+        return cached
+
+    def fetch(self, dataset_id, dataset_version, path, dest, download, checksum=None) -> Path:
+        """
+        Make the file available at *dest*, downloading it into the cache only
+        on a miss. *dest* is a hard link to the cached copy where possible
+        (so eviction never pulls a file from under a running conversion),
+        otherwise a copy.
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            cached = self.get(dataset_id, dataset_version, path, checksum)
+            if cached is not None:
+                self._materialise(cached, dest)
+                return dest
+        self.put(dataset_id, dataset_version, path, download, checksum, dest=dest)
+        return dest
+
+    @staticmethod
+    def _materialise(cached: Path, dest: Path) -> None:
+        if dest.exists():
+            dest.unlink()
+        try:
+            os.link(cached, dest)
+        except OSError:                      # other filesystem, no hard links, …
+            shutil.copy2(cached, dest)
+
+    def evict(self, keep: Path | None = None) -> None:
+        """Delete least-recently-used entries until the cache fits *max_bytes*."""
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            entries = []
+            for entry_dir in self.cache_dir.iterdir():
+                if not entry_dir.is_dir() or entry_dir.name.startswith("."):
+                    continue
+                files = [f for f in entry_dir.iterdir() if f.name != "entry.json"]
+                if not files:
+                    continue
+                stat = files[0].stat()
+                entries.append((stat.st_mtime, stat.st_size, entry_dir))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry_dir in sorted(entries, key=lambda e: e[0]):
+                if total <= self.max_bytes:
+                    break
+                if keep is not None and entry_dir == keep:
+                    continue
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total -= size
+
+
+def fetch_sparc_file(dataset_id, dataset_version, file_path, dest, *, file_record=None,
+                     cache=None, chunk_size=None, backend=None):
+    """
+    Places a dataset file at *dest*, going through *cache* when one is given.
+
+    Args:
+        dataset_id (str or int): The identifier of the SPARC dataset.
+        dataset_version (str or int): The published version of the dataset.
+        file_path (str): Path of the file inside the dataset, e.g. 'files/primary/...'.
+        dest (str or Path): Where the file should end up.
+        file_record (dict, optional): The file's entry in the dataset metadata. Its size and
+            checksum are used to verify the download and to validate cache hits.
+        cache (RawFileCache, optional): Raw download cache. Defaults to None (always download).
+        chunk_size (int, optional): Bytes per streamed chunk. Defaults to DOWNLOAD_CHUNK_SIZE.
+        backend (str or backend object, optional): Where to download from, a key of
+            DOWNLOAD_BACKENDS ("zipit", "s3") or an instance. Defaults to zipit.
+
+    Returns:
+        Path: *dest*.
+
+    Raises:
+        requests.HTTPError: If the download request fails.
+        RuntimeError: If the download does not match the size or checksum in *file_record*.
+    """
+    backend = _as_backend(backend)
+    if chunk_size is not None and isinstance(backend, ZipitBackend):
+        backend = ZipitBackend(chunk_size=chunk_size)
+
+    def _download(target):
+        return backend.download(dataset_id, dataset_version, file_path, target,
+                                file_record=file_record)
+
+    if cache is None:
+        return _download(dest)
+    return cache.fetch(
+        dataset_id, dataset_version, file_path, dest,
+        download=_download,
+        checksum=_source_checksum(file_record),
+    )
+
+
+def _as_cache(cache) -> RawFileCache | None:
+    """Accept a RawFileCache, a cache directory or None."""
+    if cache is None or isinstance(cache, RawFileCache):
+        return cache
+    return RawFileCache(cache)
+
+
+def download_and_move_sparc_file(rel_path, dataset_id, output_dir, cache=None):
     """
     Downloads a file from a SPARC dataset using the provided relative path and dataset ID,
     then moves the downloaded file to the specified output directory.
 
-    The function ensures the relative path starts with 'primary/', constructs the appropriate
-    query path for the SPARC API, and handles file download and movement. If the file is not
-    found or an error occurs during download or movement, an error message is printed.
+    The function ensures the relative path starts with 'primary/', looks the file up in the
+    (cached) dataset metadata, and streams the file straight into the output directory
+    (no working-directory changes, so it is safe to call concurrently). If the file is not
+    found or an error occurs during download, an error message is printed.
 
     Args:
         rel_path (str): The relative path to the file within the SPARC dataset.
         dataset_id (str): The identifier of the SPARC dataset to download from.
         output_dir (str): The directory where the downloaded file should be moved.
+        cache (RawFileCache or str, optional): Raw download cache (or its directory) to serve
+            the file from / store it in. Defaults to None.
 
     Raises:
         FileNotFoundError: If no matching file is found in the SPARC dataset.
         Exception: For any other errors encountered during download or file movement.
     """
-    if not rel_path.startswith("primary/"):
-        rel_path = f"primary/{rel_path}"
+    rel_path = _dataset_rel_path(rel_path)
 
     # SPARC expects 'files/primary/...'
     query_path = f"files/{rel_path}"
@@ -115,19 +738,20 @@ def download_and_move_sparc_file(rel_path, dataset_id, output_dir):
     print(f"[INFO] Downloading {rel_path} from SPARC dataset {dataset_id}...")
 
     try:
-        files = client.pennsieve.list_files(dataset_id=dataset_id, query=query_path)
-        if not files:
-            raise FileNotFoundError(f"No matching file for {query_path}")
-
-        result = client.pennsieve.download_file(file_list=files[0])
-        print(f"[INFO] Download result: {result}")
-
-        # Move file to output directory
-        os.makedirs(output_dir, exist_ok=True)
-        src_path = os.path.abspath(local_filename)
-        dest_path = os.path.join(output_dir, local_filename)
-        shutil.move(src_path, dest_path)
-        print(f"[INFO] Moved file to: {dest_path}")
+        metadata    = fetch_dataset_metadata(dataset_id)
+        file_record = index_dataset_files(metadata).get(rel_path)
+        if file_record is None:
+            file_record = _resolve_with_list_files(dataset_id, query_path)
+
+        dest_path = fetch_sparc_file(
+            dataset_id,
+            metadata.get("version", file_record.get("datasetVersion", 1)),
+            file_record.get("path", query_path),
+            Path(output_dir) / local_filename,
+            file_record=file_record,
+            cache=_as_cache(cache),
+        )
+        print(f"[INFO] Downloaded file to: {dest_path}")
 
         # TODO: your actual file conversion logic goes here
 
@@ -280,6 +904,92 @@ def _run(cmd: list[str]) -> None:
             f"Command failed ({' '.join(cmd)}):\nSTDOUT:\n{proc.stdout}\nSTDERR:\n{proc.stderr}"
         )
 
+def _imaging_output_path(local_path: Path, output_dir: Path) -> Path:
+    """
+    Path of the OME-Zarr store `convert_imaging_file` writes for *local_path*.
+
+    Formats that are first re-packed to an intermediate ``.ome.tif`` inherit
+    that file's stem, everything else keeps the original stem.
+    """
+    ext = local_path.suffix.lower()
+    if ext == ".nd2" or ext in _RGB_EXTS or ext == ".lif" or ext in _BF_EXTS:
+        local_path = local_path.with_suffix(".ome.tif")
+    return output_dir / f"{local_path.stem}.ome.zarr"
+
+
+def _std_output_path(output_dir: Path, filename: str, file_format: str) -> Path:
+    """Path of the standardized output written for a signal file called *filename*."""
+    return (output_dir / f"{Path(filename).stem}_std").with_suffix(f".{file_format}")
+
+
+def _output_subdir(output_dir: Path, rel_path: str) -> Path:
+    """
+    Directory receiving the output of primary file *rel_path*: its folder below
+    ``primary/`` mirrored into *output_dir* (``primary/sub-1/rec.csv`` →
+    ``<output_dir>/sub-1``), so files sharing a name in different subject or
+    sample folders never write to the same store.
+    """
+    parts = Path(_dataset_rel_path(rel_path)).parts[1:-1]
+    return output_dir.joinpath(*(p for p in parts if p not in (".", "..")))
+
+
+def _read_output_metadata(path: Path) -> dict | None:
+    """
+    Read the metadata of an existing output, or None if it cannot be read
+    (e.g. a store truncated by an interrupted run). Only the metadata is
+    loaded, never the signal arrays.
+    """
+    try:
+        if path.suffix == ".npz":
+            with np.load(path, allow_pickle=True) as npz:
+                meta = npz["metadata"].item()
+        elif path.suffix == ".mat":
+            from scipy.io import loadmat
+            meta = loadmat(str(path), variable_names=["metadata"],
+                           simplify_cells=True)["metadata"]
+        elif path.name.endswith(".zarr.zip"):
+            store = zarr.ZipStore(str(path), mode="r")
+            try:
+                meta = dict(zarr.open_group(store=store, mode="r").attrs)
+            finally:
+                store.close()
+        else:
+            meta = dict(zarr.open_group(str(path), mode="r").attrs)
+    except Exception:
+        return None
+    return meta if isinstance(meta, dict) else None
+
+
+def _read_output_source(path: Path) -> dict | None:
+    """
+    Read the ``sparc_source`` record (dataset version, source checksum, …)
+    embedded in an existing output, or None if it has none or cannot be read.
+    """
+    source = (_read_output_metadata(path) or {}).get("sparc_source")
+    return source if isinstance(source, dict) else None
+
+
+def _output_is_fresh(path: Path, source: dict, *, trust_legacy: bool = False) -> bool:
+    """
+    True if *path* exists and was produced from the same dataset version and
+    source file (path and checksum) as described by *source*. An unreadable
+    output is stale; one without a ``sparc_source`` record (written before the
+    record existed) is trusted only with *trust_legacy*.
+    """
+    if not path.exists():
+        return False
+    meta = _read_output_metadata(path)
+    if meta is None:
+        return False
+    stored = meta.get("sparc_source")
+    if not isinstance(stored, dict):
+        return trust_legacy
+    return all(
+        stored.get(key) == source.get(key)
+        for key in ("dataset_version", "path", "checksum")
+        if source.get(key) is not None
+    )
+
 # -------------------------------------------------------------------------
 # 3. main helper
 # -------------------------------------------------------------------------
@@ -350,7 +1060,7 @@ def convert_imaging_file(
         tif_path = local_path
 
     # ---------- B. run ngff-zarr ------------------------------------------
-    zarr_out = output_dir / f"{tif_path.stem}.ome.zarr"
+    zarr_out = _imaging_output_path(local_path, output_dir)
     cmd = [
         "ngff-zarr",
         "-i", str(tif_path),
@@ -406,6 +1116,322 @@ IMAGING_EXTS     = {ext for ext, kind in modality_lookup.items() if kind == "Ima
 TIMESERIES_EXTS  = {ext for ext, kind in modality_lookup.items() if kind == "Time Series"}
 SUPPORTED_EXTS   = IMAGING_EXTS | TIMESERIES_EXTS
 
+# -------------------------------------------------------------------------
+# 4. per-file worker helpers
+# -------------------------------------------------------------------------
+# populated by `_init_convert_worker` inside process-pool workers
+_WORKER_STATE: dict = {}
+
+
+class _ScratchBudget:
+    """
+    Byte budget for raw downloads sitting on the scratch disk.
+
+    Download workers `acquire` the expected size of a file before fetching it
+    and the conversion stage `release`s it once the raw file is deleted.
+    Acquiring blocks while the budget is exhausted or while the scratch
+    filesystem has less than *min_free_bytes* left – this is the pipeline's
+    back-pressure. A single file larger than the whole budget is still let
+    through when nothing else is held, so the pipeline cannot deadlock. The
+    free-space floor has no such exception: with nothing held no release
+    will ever make room, so `acquire` raises RuntimeError instead of waiting.
+    """
+
+    def __init__(self, max_bytes: int | None, scratch_dir: Path, min_free_bytes: int = 0):
+        self.max_bytes      = max_bytes
+        self.scratch_dir    = scratch_dir
+        self.min_free_bytes = min_free_bytes
+        self.used           = 0
+        self._cond          = threading.Condition()
+
+    def _fits(self, nbytes: int) -> bool:
+        if self.min_free_bytes:
+            free = shutil.disk_usage(self.scratch_dir).free
+            if free - nbytes < self.min_free_bytes:
+                if self.used == 0:
+                    raise RuntimeError(
+                        f"Only {free} bytes free in {self.scratch_dir}: a {nbytes}-byte download "
+                        f"would drop below min_free_bytes={self.min_free_bytes}")
+                return False
+        if self.used == 0:
+            return True
+        return self.max_bytes is None or self.used + nbytes <= self.max_bytes
+
+    def acquire(self, nbytes: int) -> None:
+        with self._cond:
+            # re-check periodically: disk space can be freed by others
+            while not self._fits(nbytes):
+                self._cond.wait(timeout=1.0)
+            self.used += nbytes
+
+    def charge(self, nbytes: int) -> None:
+        """Account for *nbytes* without waiting (size only known after download)."""
+        with self._cond:
+            self.used += nbytes
+
+    def release(self, nbytes: int) -> None:
+        with self._cond:
+            self.used = max(0, self.used - nbytes)
+            self._cond.notify_all()
+
+
+def _source_checksum(file_record: dict | None):
+    """
+    Best available content identity for a file record of the dataset metadata:
+    its checksum when the metadata provides one, otherwise the S3 version id.
+    """
+    if not file_record:
+        return None
+    checksum = file_record.get("checksum")
+    if isinstance(checksum, dict):
+        checksum = checksum.get("checksum") or checksum.get("value")
+    return checksum or file_record.get("s3VersionId")
+
+
+class ConversionManifest:
+    """
+    Append-only JSON-lines log of a dataset conversion, kept in the output directory.
+
+    Every finished file appends one ``{"event": "file", ...}`` line holding its
+    ``rel_path``, ``status``, source ``size``/``checksum``, ``dataset_version``,
+    ``descriptor_id``, ``std_path`` and ``error``; the latest line for a path wins.
+    Each run starts with a ``{"event": "run", ...}`` line listing the files it
+    was asked to convert. Appending keeps the cost per file constant and leaves
+    a valid manifest behind even if the process dies mid-run.
+    """
+
+    def __init__(self, output_dir: Path, dataset_id, *, resume: bool = False):
+        self.path    = Path(output_dir) / f"sparcfuse_manifest_{dataset_id}.jsonl"
+        self.entries = {}                    # rel_path -> latest file entry
+        self.run     = None                  # latest run header
+        self._lock   = threading.Lock()
+
+        if resume and self.path.exists():
+            self._replay()
+        elif self.path.exists():
+            self.path.unlink()               # fresh run → fresh manifest
+
+    def _replay(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue                 # torn last line of a killed run
+                if entry.get("event") == "run":
+                    self.run = entry
+                elif entry.get("event") == "file":
+                    self.entries[entry["rel_path"]] = entry
+
+    def _append(self, entry: dict) -> None:
+        with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry, default=str) + "\n")
+            fh.flush()
+
+    def start(self, primary_paths, *, full_run: bool) -> None:
+        """Record the list of files this run works on."""
+        self.run = {
+            "event": "run",
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "full_run": full_run,
+            "paths": list(primary_paths),
+        }
+        self._append(self.run)
+
+    def completed(self, rel_path: str) -> dict | None:
+        """The recorded result of *rel_path* if it finished and its output still exists."""
+        entry = self.entries.get(rel_path)
+        if not entry or entry.get("status") != "ok":
+            return None
+        if not entry.get("std_path") or not Path(entry["std_path"]).exists():
+            return None
+        return entry
+
+    def record(self, rec: dict, *, file_record: dict | None = None, dataset_version=None) -> None:
+        """Append the outcome of one file (a result record of the pipeline)."""
+        entry = {
+            "event": "file",
+            "rel_path": rec["rel_path"],
+            "status": rec["status"],
+            "size": (file_record or {}).get("size"),
+            "checksum": _source_checksum(file_record),
+            "dataset_version": dataset_version,
+            "descriptor_id": rec.get("descriptor_id"),
+            "mapping_score": rec.get("mapping_score"),
+            "std_path": rec.get("std_path"),
+            "error": rec.get("error"),
+            "updated": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.entries[rec["rel_path"]] = entry
+        self._append(entry)
+
+
+def _new_record(rel_path: str) -> dict:
+    """Empty per-file result record as returned by `download_and_convert_sparc_data`."""
+    return {
+        "rel_path": rel_path,
+        "local_path": None,      # tmp path (will vanish)
+        "std_path": None,
+        "descriptor_id": None,
+        "mapping_score": None,
+        "status": "pending",
+        "error": None,
+    }
+
+
+def _download_primary_file(
+    dataset_id,
+    rel_path: str,
+    tmpdir: Path,
+    *,
+    cache: RawFileCache | None = None,
+    dataset_version=None,
+    file_record: dict | None = None,
+    backend=None,
+) -> Path:
+    """
+    Download a single primary file of *dataset_id* into *tmpdir*.
+
+    Parameters:
+        dataset_id (int): SPARC dataset the file belongs to.
+        rel_path (str): Path relative to the dataset's ``files/`` folder.
+        tmpdir (Path): Scratch directory that receives the raw file.
+        cache (RawFileCache | None): Raw download cache. On a hit (looked up with
+            *dataset_version* and *file_record*) no request is made at all.
+        dataset_version (int | None): Published version from the dataset metadata.
+        file_record (dict | None): The file's entry in the dataset metadata (see
+            `index_dataset_files`). Only when it is missing is the file looked up
+            with a Pennsieve search request.
+        backend (ZipitBackend | S3Backend | None): Download backend. Defaults to zipit.
+
+    Returns:
+        Path: Location of the downloaded file.
+
+    Raises:
+        FileNotFoundError: If no matching file is found in the dataset.
+        requests.HTTPError: If the download request fails.
+    """
+    rel_path   = _dataset_rel_path(rel_path)
+    query_path = f"files/{rel_path}"
+    filename   = os.path.basename(rel_path)
+    checksum   = _source_checksum(file_record)
+
+    def _download(target):
+        record = file_record or _resolve_with_list_files(dataset_id, query_path)
+
+        # stream straight into target – no chdir, so downloads can run in parallel
+        version = dataset_version if dataset_version is not None else record.get("datasetVersion", 1)
+        return _as_backend(backend).download(
+            dataset_id, version, record.get("path", query_path), target,
+            file_record=record,
+        )
+
+    if cache is not None and dataset_version is not None:
+        return cache.fetch(dataset_id, dataset_version, query_path, tmpdir / filename,
+                           download=_download, checksum=checksum)
+    return _download(tmpdir / filename)
+
+
+def _init_convert_worker(descriptors_dir, sparc_meta, mapping_cache_path=None) -> None:
+    """
+    Process-pool initializer: index the mapping descriptors (which hold
+    unpicklable post-processing functions) and keep the dataset metadata once
+    per worker process. Scheme modules are imported lazily, on first use.
+    Each worker keeps its own mapping cache, shared through
+    *mapping_cache_path* when the run persists it.
+    """
+    _WORKER_STATE["descriptors"]   = DescriptorRegistry(descriptors_dir)
+    _WORKER_STATE["sparc_meta"]    = sparc_meta
+    _WORKER_STATE["mapping_cache"] = MappingCache(mapping_cache_path)
+
+
+def _convert_local_file(
+    local_file: Path,
+    *,
+    dataset_id: int,
+    output_dir: Path,
+    file_format: str,
+    source: dict | None = None,
+    descriptors=None,
+    sparc_meta=None,
+    mapping_cache=None,
+    mapping_options: dict | None = None,
+    save_options: dict | None = None,
+) -> dict:
+    """
+    Convert one downloaded file and return the fields to merge into its
+    result record (``std_path``, ``descriptor_id``, ``mapping_score``, ``status``).
+
+    The output is always (re)written – whether an existing output is still
+    current is decided before the download. *source* (dataset version and
+    checksum of the raw file) is embedded as ``sparc_source`` so later runs
+    can make that decision. When *descriptors*/*sparc_meta* are omitted the
+    per-process state set up by `_init_convert_worker` is used.
+    *mapping_options* are passed on to `match_best_mapping` (candidate
+    worker processes and their limits), *save_options* to
+    `save_standardized_output` (storage dtype, time encoding, chunking, codec).
+    """
+    source = dict(source or {})
+    if descriptors is None:
+        descriptors   = _WORKER_STATE["descriptors"]
+        sparc_meta    = _WORKER_STATE["sparc_meta"]
+        mapping_cache = _WORKER_STATE.get("mapping_cache")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ext = local_file.suffix.lower()
+    if ext in IMAGING_EXTS:
+        # ---------- imaging branch ----------------------------------------
+        zarr_path = convert_imaging_file(local_file, output_dir=output_dir)
+        try:
+            root = zarr.open_group(str(zarr_path), mode="a")   # reopen for attrs
+            root.attrs["sparc_metadata"] = sparc_meta
+            root.attrs["sparc_dataset_id"] = dataset_id
+            root.attrs["sparc_source"] = {**source, "descriptor_id": "imaging-pipeline"}
+        finally:
+            root.store.close()
+
+        return dict(
+            std_path=str(zarr_path),
+            descriptor_id="imaging-pipeline",
+            status="ok",
+        )
+
+    # ---------- signal-mapping branch -------------------------------------
+    # the winner stays open until saved: streaming descriptors read their
+    # blocks from it while the output is written
+    mapping = match_best_mapping(
+        descriptors, filepath=str(local_file), sparc_id=dataset_id,
+        cache=mapping_cache, keep_open=True, **(mapping_options or {}),
+    )
+    if mapping["descriptor"] is None:
+        hits = ", ".join(f"{h['descriptor_id']}: {h['limit']}" for h in mapping.get("limits_hit", []))
+        raise RuntimeError("No usable mapping descriptor found"
+                           + (f" (limits hit – {hits})" if hits else ""))
+
+    descriptor   = mapping["descriptor"]
+    result_dict  = mapping["result"]
+    std_path     = _std_output_path(output_dir, local_file.name, file_format)
+    source["descriptor_id"] = descriptor.get("id")
+
+    with mapping["session"]:
+        save_standardized_output(
+            output_path=str(output_dir / f"{local_file.stem}_std"),
+            result_dict=result_dict,
+            descriptor=descriptor,
+            original_filename=local_file.name,
+            file_format=file_format,
+            metadata_overrides={"sparc_metadata": sparc_meta, "sparc_source": source},
+            **(save_options or {}),
+        )
+
+    return dict(
+        std_path=str(std_path),
+        descriptor_id=descriptor.get("id"),
+        mapping_score=mapping["score"],
+        status="ok",
+    )
+
+
 def download_and_convert_sparc_data(
     dataset_id: int,
     primary_paths=None,
@@ -414,6 +1440,25 @@ def download_and_convert_sparc_data(
     descriptors_dir: str | Path = "./mapping_schemes",
     file_format: str = "npz",
     overwrite: bool = False,
+    trust_legacy_outputs: bool = False,
+    max_workers: int = 1,
+    convert_workers: int | None = None,
+    executor: str = "thread",
+    prefetch: int = 2,
+    prefetch_bytes: int | None = None,
+    scratch_dir: str | Path | None = None,
+    min_free_bytes: int = 0,
+    resume: bool = False,
+    cache: RawFileCache | str | Path | None = None,
+    backend: str | object = "zipit",
+    mapping_cache: MappingCache | str | Path | bool | None = True,
+    mapping_workers: int = 1,
+    mapping_timeout: float | None = None,
+    mapping_memory_limit: int | None = None,
+    signal_dtype: str = "f8",
+    time_encoding: str = "auto",
+    chunk_bytes: int = 4 * 2**20,
+    compression: str | None = None,
 ):
     """
     Download → convert → clean-up pipeline.
@@ -423,6 +1468,13 @@ def download_and_convert_sparc_data(
     Raw downloads are stored only in a TemporaryDirectory and are
     deleted as soon as conversion finishes.
 
+    Downloading and converting run as two overlapping stages: download
+    workers fill a bounded prefetch queue which the conversion stage drains,
+    so file k+1 is fetched while file k is being mapped. The queue holds at
+    most `prefetch` finished downloads, and downloads stall while the raw
+    bytes on scratch exceed `prefetch_bytes` or free space drops below
+    `min_free_bytes`.
+
     Parameters:
         dataset_id (int): The unique identifier of the SPARC dataset to process.
         primary_paths (list[str] | str | None, optional): List of relative paths to primary files within the dataset.
@@ -430,10 +1482,70 @@ def download_and_convert_sparc_data(
         output_dir (str | Path, optional): Directory where converted files will be saved. Defaults to "./output".
         descriptors_dir (str | Path, optional): Directory containing mapping descriptors. Defaults to "./mapping_schemes".
         file_format (str, optional): Output file format for standardized data. Defaults to "npz".
-        overwrite (bool, optional): If True, existing standardized files will be overwritten. Defaults to False.
+        overwrite (bool, optional): If True, existing outputs are regenerated. Otherwise a file whose
+            output (``<stem>_std.<fmt>`` or ``<stem>.ome.zarr``, in the file's folder below ``primary/``
+            mirrored into `output_dir`) already exists and was built from the
+            same dataset version, source path and checksum is skipped before it is downloaded. Defaults to False.
+        trust_legacy_outputs (bool, optional): Also skip existing outputs that carry no source record
+            (written by versions before it was embedded) instead of regenerating them. Unreadable
+            outputs are always regenerated. Defaults to False.
+        max_workers (int, optional): Number of per-file jobs (download stage, I/O-bound) running
+            concurrently in a thread pool. Defaults to 1 (strictly serial).
+        convert_workers (int | None, optional): Size of the pool running the CPU-bound conversion
+            stage. Defaults to `max_workers`.
+        executor (str, optional): Pool type for the conversion stage, "thread" or "process".
+            Process workers load the mapping descriptors themselves. Defaults to "thread".
+        prefetch (int, optional): Number of downloaded files allowed to wait for conversion. Defaults to 2.
+        prefetch_bytes (int | None, optional): Cap on raw bytes held on the scratch disk
+            (downloading, queued or converting). Defaults to None (no cap).
+        scratch_dir (str | Path | None, optional): Where raw downloads are staged.
+            Defaults to the system temporary directory.
+        min_free_bytes (int, optional): Pause downloads while the scratch filesystem has
+            less free space than this; a file that would drop below it while no other raw
+            file is held fails instead. Defaults to 0 (disabled).
+        resume (bool, optional): Continue a previous run from the manifest in `output_dir`:
+            files recorded as converted (whose output still exists) are skipped before any
+            network I/O and only failed or unfinished ones are processed. Without it a fresh
+            manifest is started. Defaults to False.
+        cache (RawFileCache | str | Path | None, optional): Raw download cache (or its directory).
+            Files found there are not downloaded again, new downloads are added to it.
+            Defaults to None (raw files are only kept for the duration of their conversion).
+        backend (str | object, optional): Download backend, "zipit" (Pennsieve zipit service) or
+            "s3" (parallel ranged reads from the requester-pays SPARC S3 mirror, see `S3Backend`),
+            or a configured backend instance. Defaults to "zipit".
+        mapping_cache (MappingCache | str | Path | bool | None, optional): Remembers the descriptor
+            that mapped each kind of file (sparc_id, extension, header fingerprint) so the remaining
+            files skip the candidate search. True keeps it in `sparcfuse_mapping_cache.json` in
+            `output_dir` for later runs; a path or `MappingCache` selects another store; False/None
+            keeps it in memory for this run only. Defaults to True.
+        mapping_workers (int, optional): When several descriptors remain candidates for a file, score
+            them in this many isolated worker processes at once; only the winner's result is sent back. Defaults to 1
+            (candidates are tried one after another).
+        mapping_timeout (float | None, optional): Wall-clock seconds a candidate may run before it is
+            killed and counted as failed. Setting a limit runs candidates in worker processes even with
+            `mapping_workers=1`. Defaults to None (no limit).
+        mapping_memory_limit (int | None, optional): Resident memory in bytes a candidate may use
+            before it is killed. Defaults to None (no limit).
+        signal_dtype (str, optional): Stored sample type of the signals, a numpy dtype or "native".
+            "native" (or an integer dtype) keeps raw ADC samples of readers that provide per-channel
+            gain/offset and records them as ``scale_factor``/``add_offset`` for readers to apply.
+            Defaults to "f8" (physical units, float64).
+        time_encoding (str, optional): "auto" stores a regularly sampled time axis of zarr outputs
+            as start time, sampling frequency and length only, keeping explicit arrays for irregular
+            or segmented time; "explicit" always writes the time array. npz and mat outputs always
+            hold the time array. Defaults to "auto".
+        chunk_bytes (int, optional): Target size of one zarr signals chunk; chunks are time-major
+            (a group of up to 16 channels over a long time window). The chosen shape is recorded
+            as ``chunking`` in the output metadata. Defaults to 4 MiB.
+        compression (str | None, optional): Zarr codec, "<codec>[:<level>][:<shuffle>][+delta]" with
+            codec zstd, lz4, lz4hc, blosclz or zlib and shuffle "shuffle", "bitshuffle" or "noshuffle";
+            "+delta" adds a delta filter for integer samples (see ``signal_dtype="native"``), "none"
+            disables compression. E.g. "zstd:5:bitshuffle+delta". Defaults to None (zarr's default,
+            Blosc lz4).
         
     Returns:
-        list[dict]: A list of dictionaries containing the results of the conversion process for each file.
+        list[dict]: A list of dictionaries containing the results of the conversion process for each file,
+            in the same order as `primary_paths`.
             Each dictionary includes:
                 - rel_path: Relative path of the file within the dataset.
                 - local_path: Temporary local path where the file was downloaded.
@@ -444,28 +1556,41 @@ def download_and_convert_sparc_data(
                 - error: Error message if processing failed.
 
     Raises:
-        ValueError: If no primary files are found to process.
+        ValueError: If no primary files are found to process, or `executor` is unknown.
         RuntimeError: If the download fails or the file cannot be processed.
         FileNotFoundError: If no matching file is found in the dataset for the given relative path.
         Exception: For any other errors encountered during the download or conversion process.
     
     Notes:
         - The function uses a temporary directory for downloading files, which is automatically cleaned up after processing.
+        - Sizes from the dataset metadata are used to reserve scratch space before a download starts.
+        - Progress is logged to `sparcfuse_manifest_<dataset_id>.jsonl` in the output directory
+          (see `ConversionManifest`).
         - The output directory is created if it does not exist.
         - Metadata from the SPARC dataset is fetched and included in the standardized output.
     - The function supports both imaging and time series data, routing them through appropriate conversion methods.
     """
+    if executor not in ("thread", "process"):
+        raise ValueError(f"Unknown executor '{executor}' (expected 'thread' or 'process')")
+    cache           = _as_cache(cache)
+    backend         = _as_backend(backend)
+    max_workers     = max(1, int(max_workers))
+    convert_workers = max(1, int(convert_workers or max_workers))
 
     output_dir = Path(output_dir).expanduser()
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # fetch metadata for the dataset
-    sparc_meta = fetch_dataset_metadata(dataset_id)  # full JSON dict
+    manifest   = ConversionManifest(output_dir, dataset_id, resume=resume)
+    sparc_meta = None                        # fetched lazily, only if work remains
 
-    
     # ---------- A. figure out which primary files to work on --------------
-    if primary_paths is None:
-        files, _ = list_primary_files(dataset_id)
+    full_run = primary_paths is None
+    if full_run and manifest.run and manifest.run.get("full_run"):
+        primary_paths = list(manifest.run["paths"])   # resume: no need to re-list
+    elif full_run:
+        # fetch metadata for the dataset
+        sparc_meta = fetch_dataset_metadata(dataset_id)  # full JSON dict
+        files, _ = list_primary_files(dataset_id, metadata=sparc_meta)
         primary_paths = [f["path"].replace("files/", "") for f in files]
     elif isinstance(primary_paths, str):
         primary_paths = [primary_paths]
@@ -475,119 +1600,222 @@ def download_and_convert_sparc_data(
     if not primary_paths:
         raise ValueError("No primary files to process.")
 
-    # ---------- B. load mapping descriptors once --------------------------
-    descriptors = load_all_descriptors(directory=str(descriptors_dir))
-    results = []
-
-    # ---------- C. main loop ----------------------------------------------
-    for rel_path in tqdm(primary_paths, desc=f"Dataset {dataset_id}"):
-        rec = {
-            "rel_path": rel_path,
-            "local_path": None,      # tmp path (will vanish)
-            "std_path": None,
-            "descriptor_id": None,
-            "mapping_score": None,
-            "status": "pending",
-            "error": None,
-        }
+    manifest.start(primary_paths, full_run=full_run)
 
+    results  = [None] * len(primary_paths)
+    pending  = []
+    for idx, rel_path in enumerate(primary_paths):
         ext = Path(rel_path).suffix.lower()
         if ext not in SUPPORTED_EXTS:
+            rec = _new_record(rel_path)
             rec.update(status="unsupported",
                        error=f"Extension '{ext}' not supported by pipeline")
-            results.append(rec)
-            continue                         # ── skip to next file ──
-
-
-        try:
-            # ===== 1. download into a fresh tmp dir =======================
-            with tempfile.TemporaryDirectory() as tmpdir:
-                tmpdir = Path(tmpdir)
-                if not rel_path.startswith("primary/"):
-                    rel_path_ds = f"primary/{rel_path}"
-                else:
-                    rel_path_ds = rel_path
-                query_path = f"files/{rel_path_ds}"
-                filename   = os.path.basename(rel_path_ds)
-
-                files = client.pennsieve.list_files(dataset_id=dataset_id, query=query_path)
-                if not files:
-                    raise FileNotFoundError(f"No matching file for {query_path}")
-
-                # Pennsieve will write into the *current* working directory.
-                old_cwd = os.getcwd()
-                try:
-                    os.chdir(tmpdir)
-                    client.pennsieve.download_file(file_list=files[0])   # ← no destination_dir
-                finally:
-                    os.chdir(old_cwd)
-
-                local_file = tmpdir / filename
-                if not local_file.exists():
-                    # Some Pennsieve builds create a sub-folder; fall back to glob search
-                    matches = list(tmpdir.rglob(filename))
-                    if matches:
-                        local_file = matches[0]
-                    else:
-                        raise RuntimeError(f"Download failed: {filename} not found in {tmpdir}")
-
-
+            results[idx] = rec
+            manifest.record(rec)
+            continue                         # ── never downloaded ──
+
+        done = manifest.completed(rel_path)  # only populated with resume=True
+        if done is not None:
+            rec = _new_record(rel_path)
+            rec.update({k: done.get(k) for k in ("std_path", "descriptor_id", "mapping_score")},
+                       status="ok")
+            results[idx] = rec
+            continue                         # ── converted by an earlier run ──
+        pending.append(idx)
+
+    if not pending:
+        return results                       # nothing left to do – no network I/O
+
+    if sparc_meta is None:
+        sparc_meta = fetch_dataset_metadata(dataset_id)  # full JSON dict
+    dataset_version = sparc_meta.get("version")
+
+    # resolve every requested path in one pass – the download stage never
+    # has to search for a file
+    file_index = index_dataset_files(sparc_meta)
+
+    def _file_record(rel_path):
+        return file_index.get(_dataset_rel_path(rel_path))
+
+    def _record(rec):
+        manifest.record(rec, file_record=_file_record(rec["rel_path"]),
+                        dataset_version=dataset_version)
+
+    def _source(rel_path):
+        file_record = _file_record(rel_path) or {}
+        source = {
+            "dataset_id": dataset_id,
+            "dataset_version": dataset_version,
+            "path": file_record.get("path"),
+            "checksum": _source_checksum(file_record),
+        }
+        return {k: v for k, v in source.items() if v is not None}
+
+    def _expected_output(rel_path):
+        filename = os.path.basename(rel_path)
+        subdir   = _output_subdir(output_dir, rel_path)
+        if Path(filename).suffix.lower() in IMAGING_EXTS:
+            return _imaging_output_path(Path(filename), subdir)
+        return _std_output_path(subdir, filename, file_format)
+
+    # ---------- no two files may write the same output --------------------
+    # (e.g. rec.csv and rec.mat in one folder); later ones are refused
+    claimed, still_pending = {}, []
+    for idx in pending:
+        rel_path = primary_paths[idx]
+        out_path = _expected_output(rel_path)
+        if out_path in claimed:
+            rec = _new_record(rel_path)
+            rec.update(status="failed",
+                       error=f"Output {out_path} is already written for '{claimed[out_path]}'")
+            results[idx] = rec
+            _record(rec)
+        else:
+            claimed[out_path] = rel_path
+            still_pending.append(idx)
+    pending = still_pending
+
+    # ---------- existing outputs are checked before anything is fetched ----
+    if not overwrite:
+        still_pending = []
+        for idx in pending:
+            rel_path = primary_paths[idx]
+            out_path = _expected_output(rel_path)
+            if _output_is_fresh(out_path, _source(rel_path), trust_legacy=trust_legacy_outputs):
+                stored = _read_output_source(out_path) or {}
+                rec = _new_record(rel_path)
+                rec.update(std_path=str(out_path),
+                           descriptor_id=stored.get("descriptor_id"),
+                           status="ok")
+                results[idx] = rec
+                _record(rec)
+            else:
+                still_pending.append(idx)
+        pending = still_pending
+
+    if not pending:
+        return results                       # every output is up to date
+
+    # ---------- B. index mapping descriptors once -------------------------
+    if not isinstance(mapping_cache, MappingCache):
+        if mapping_cache is True:
+            mapping_cache = output_dir / "sparcfuse_mapping_cache.json"
+        mapping_cache = MappingCache(mapping_cache or None)
+
+    if executor == "process":
+        descriptors = None                   # loaded inside each worker
+        # not fork: download threads may hold locks while the pool starts workers
+        convert_pool = ProcessPoolExecutor(
+            max_workers=convert_workers,
+            mp_context=_mp_context(),
+            initializer=_init_convert_worker,
+            initargs=(descriptors_dir, sparc_meta, mapping_cache.path),
+        )
+    else:
+        descriptors = DescriptorRegistry(descriptors_dir)
+        convert_pool = ThreadPoolExecutor(max_workers=convert_workers)
+
+    convert_kwargs = dict(
+        dataset_id=dataset_id,
+        file_format=file_format,
+        mapping_options=dict(
+            workers=max(1, int(mapping_workers)),
+            timeout=mapping_timeout,
+            memory_limit=mapping_memory_limit,
+        ),
+        save_options=dict(
+            signal_dtype=signal_dtype,
+            time_encoding=time_encoding,
+            chunk_bytes=chunk_bytes,
+            compression=compression,
+        ),
+    )
+    if descriptors is not None:
+        convert_kwargs.update(descriptors=descriptors, sparc_meta=sparc_meta,
+                              mapping_cache=mapping_cache)
+
+    with tempfile.TemporaryDirectory(dir=scratch_dir) as scratch_root:
+        scratch_root = Path(scratch_root)
+        budget       = _ScratchBudget(prefetch_bytes, scratch_root, min_free_bytes)
+        ready        = queue.Queue(maxsize=max(1, int(prefetch)))
+        convert_slots = threading.Semaphore(convert_workers)
+
+        # ---------- C. producer: download stage ---------------------------
+        def _download_job(idx):
+            rel_path = primary_paths[idx]
+            rec      = _new_record(rel_path)
+            nbytes   = (_file_record(rel_path) or {}).get("size") or 0
+            tmpdir   = None
+            held     = 0
+            try:
+                budget.acquire(nbytes)
+                held       = nbytes
+                tmpdir     = Path(tempfile.mkdtemp(dir=scratch_root))
+                local_file = _download_primary_file(
+                    dataset_id, rel_path, tmpdir,
+                    cache=cache,
+                    dataset_version=dataset_version,
+                    file_record=_file_record(rel_path),
+                    backend=backend,
+                )
                 rec["local_path"] = str(local_file)  # for logging/debug
-
-                # ===== 2. decide which conversion branch to use ===========
-                ext = local_file.suffix.lower()
-                if ext in IMAGING_EXTS:
-                    # ---------- imaging branch ----------------------------
-                    zarr_path = convert_imaging_file(
-                        local_file, output_dir=output_dir
-                    )
-                    try:
-                        root = zarr.open_group(str(zarr_path), mode="a")   # reopen for attrs
-                        root.attrs["sparc_metadata"] = sparc_meta
-                        root.attrs["sparc_dataset_id"] = dataset_id
-                    finally:
-                        root.store.close()
-
-                    rec.update(
-                        std_path=str(zarr_path),
-                        descriptor_id="imaging-pipeline",
-                        status="ok",
-                    )
-
-                else:
-                    # ---------- signal-mapping branch ----------------------
-                    mapping = match_best_mapping(
-                        descriptors, filepath=str(local_file), sparc_id=dataset_id
-                    )
-                    if mapping["descriptor"] is None:
-                        raise RuntimeError("No usable mapping descriptor found")
-
-                    descriptor   = mapping["descriptor"]
-                    result_dict  = mapping["result"]
-                    std_base     = output_dir / f"{local_file.stem}_std"
-
-                    if overwrite or not std_base.with_suffix(f".{file_format}").exists():
-                        save_standardized_output(
-                            output_path=str(std_base),
-                            result_dict=result_dict,
-                            descriptor=descriptor,
-                            original_filename=local_file.name,
-                            file_format=file_format,
-                            metadata_overrides={"sparc_metadata": sparc_meta}
-                        )
-
-                    rec.update(
-                        std_path=str(std_base.with_suffix(f".{file_format}")),
-                        descriptor_id=descriptor.get("id"),
-                        mapping_score=mapping["score"],
-                        status="ok",
+                if not nbytes:
+                    nbytes = held = local_file.stat().st_size
+                    budget.charge(nbytes)
+            except Exception as exc:
+                rec.update(status="failed", error=str(exc))
+                if tmpdir is not None:
+                    shutil.rmtree(tmpdir, ignore_errors=True)
+                budget.release(held)
+                ready.put((idx, rec, None, None, 0))
+                return
+            ready.put((idx, rec, local_file, tmpdir, nbytes))   # blocks when queue is full
+
+        # ---------- D. consumer: conversion stage -------------------------
+        def _finish(fut, idx, rec, tmpdir, nbytes, bar):
+            try:
+                rec.update(fut.result())
+            except Exception as exc:
+                rec.update(status="failed", error=str(exc))
+            finally:
+                # raw download is deleted as soon as its conversion ends
+                shutil.rmtree(tmpdir, ignore_errors=True)
+                budget.release(nbytes)
+                results[idx] = rec
+                _record(rec)
+                convert_slots.release()
+                bar.update()
+
+        with tqdm(total=len(primary_paths), desc=f"Dataset {dataset_id}") as bar, \
+                convert_pool, ThreadPoolExecutor(max_workers=max_workers) as download_pool:
+            bar.update(len(primary_paths) - len(pending))
+            download_futures = [download_pool.submit(_download_job, idx) for idx in pending]
+
+            for _ in pending:
+                convert_slots.acquire()      # wait for a free conversion worker
+                idx, rec, local_file, tmpdir, nbytes = ready.get()
+                if local_file is None:       # download failed
+                    results[idx] = rec
+                    _record(rec)
+                    convert_slots.release()
+                    bar.update()
+                    continue
+                try:
+                    fut = convert_pool.submit(
+                        _convert_local_file, local_file,
+                        output_dir=_output_subdir(output_dir, primary_paths[idx]),
+                        source=_source(primary_paths[idx]), **convert_kwargs
                     )
+                except Exception as exc:     # e.g. broken process pool
+                    fut = Future()
+                    fut.set_exception(exc)
+                fut.add_done_callback(
+                    lambda f, i=idx, r=rec, d=tmpdir, n=nbytes: _finish(f, i, r, d, n, bar)
+                )
 
-                # tmpdir (and raw download) are deleted automatically here
-        except Exception as exc:
-            rec.update(status="failed", error=str(exc))
-
-        results.append(rec)
+            for fut in download_futures:
+                fut.result()                 # surface unexpected producer errors
+        # leaving the pools waits for every conversion (and its clean-up)
 
     return results
 
@@ -664,7 +1892,9 @@ def create_xarray_zarr_from_raw(bucket, raw_zarr_path, xarray_zarr_path, region=
 
     Notes
     -----
-    - Assumes the raw Zarr store contains "signals" and "time" arrays.
+    - Assumes the raw Zarr store contains a "signals" array and either a "time" array or a
+      regular time axis (``time_encoding="regular"``). A regular axis is not written as a
+      coordinate; `open_zarr_from_s3` rebuilds it from the dataset attributes.
     - The resulting xarray Dataset will have dimensions ("channel", "time"), where "channel" is inferred from the shape of "signals".
     - Requires `s3fs`, `zarr`, `xarray`, and `numpy` to be installed.
     """
@@ -681,18 +1911,19 @@ def create_xarray_zarr_from_raw(bucket, raw_zarr_path, xarray_zarr_path, region=
         root = zarr.open_consolidated(raw_store)
 
     # Extract arrays
-    signals = root["signals"][:]
-    time = root["time"][:]
+    signals = open_signals(root)[:]          # physical units, also when stored raw
+    coords = {"channel": ("channel", np.arange(signals.shape[0]))}
+    if "time" in root:                        # irregular/segmented: keep the explicit axis
+        coords["time"] = ("time", root["time"][:])
 
     # Build xarray dataset
-    ds = xr.Dataset(
-        {"signals": (("channel", "time"), signals)},
-        coords={"time": ("time", time), "channel": ("channel", np.arange(signals.shape[0]))},
-    )
+    ds = xr.Dataset({"signals": (("channel", "time"), signals)}, coords=coords)
 
-    # Copy over original metadata
-    ds.attrs.update(root.attrs)  # includes .zattrs (sparc_metadata, etc.)
-    ds["signals"].attrs.update(root["signals"].attrs)
+    # Copy over original metadata; the scaling of raw samples is already applied above
+    scaling = ("scale_factor", "add_offset")
+    ds.attrs.update({k: v for k, v in root.attrs.items() if k not in scaling})  # sparc_metadata, etc.
+    ds.attrs["signal_dtype"] = str(signals.dtype)
+    ds["signals"].attrs.update({k: v for k, v in root["signals"].attrs.items() if k not in scaling})
     if "time" in root:
         ds["time"].attrs.update(root["time"].attrs)
 
@@ -743,7 +1974,9 @@ def open_zarr_from_s3(bucket, zarr_path, region="eu-north-1"):
         region (str, optional): AWS region where the S3 bucket is located. Defaults to "eu-north-1".
 
     Returns:
-        xarray.Dataset: The opened Zarr dataset as an Xarray Dataset object.
+        xarray.Dataset: The opened Zarr dataset as an Xarray Dataset object. A regular time axis
+            (stored as ``time_start``/``sampling_frequency``/``n_samples`` attributes only) is
+            attached as the ``time`` coordinate, computed locally rather than read from S3.
 
     Notes:
         - Requires appropriate AWS credentials to access the S3 bucket.
@@ -754,6 +1987,11 @@ def open_zarr_from_s3(bucket, zarr_path, region="eu-north-1"):
     s3_uri = f"s3://{bucket}/{zarr_path}"
     storage_opts = {"client_kwargs": {"region_name": region}}
     try:
-        return xr.open_zarr(s3_uri, consolidated=True, storage_options=storage_opts)
+        ds = xr.open_zarr(s3_uri, consolidated=True, storage_options=storage_opts)
     except Exception:
-        return xr.open_zarr(s3_uri, consolidated=False, storage_options=storage_opts)
+        ds = xr.open_zarr(s3_uri, consolidated=False, storage_options=storage_opts)
+
+    time = open_time(ds) if "time" not in ds.coords else None
+    if time is not None:
+        ds = ds.assign_coords(time=("time", time[:]))
+    return ds
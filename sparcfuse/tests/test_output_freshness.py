@@ -0,0 +1,36 @@
+"""
+Which existing outputs let `download_and_convert_sparc_data` skip a file.
+"""
+import numpy as np
+
+from sparcfuse.sparc_fuse_core import _output_is_fresh
+
+SOURCE = {"dataset_version": 2, "path": "files/primary/sub-1/rec.csv", "checksum": "abc"}
+
+
+def _write_npz(path, metadata):
+    np.savez(path, time=np.arange(4) / 2.0, signals=np.zeros((1, 4)), metadata=metadata)
+    return path
+
+
+def test_output_from_same_source_is_fresh(tmp_path):
+    path = _write_npz(tmp_path / "rec_std.npz", {"sparc_source": SOURCE})
+
+    assert _output_is_fresh(path, SOURCE)
+    assert not _output_is_fresh(path, dict(SOURCE, dataset_version=3))
+
+
+def test_truncated_output_is_stale(tmp_path):
+    path = _write_npz(tmp_path / "rec_std.npz", {"sparc_source": SOURCE})
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) // 2])
+
+    assert not _output_is_fresh(path, SOURCE)
+    assert not _output_is_fresh(path, SOURCE, trust_legacy=True)
+
+
+def test_output_without_source_record_needs_opt_in(tmp_path):
+    path = _write_npz(tmp_path / "rec_std.npz", {"version": "v1.0"})
+
+    assert not _output_is_fresh(path, SOURCE)
+    assert _output_is_fresh(path, SOURCE, trust_legacy=True)
@@ -0,0 +1,35 @@
+"""
+Mapping schemes are loaded by file path; the helpers they import
+(`neo_rawio_chunked`, ...) must resolve without the repository root on
+``sys.path`` – as under the installed ``sparcfuse`` console script.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+from sparcfuse.utils import DescriptorRegistry
+
+SCHEME_DIR = Path(__file__).resolve().parents[2] / "mapping_schemes"
+REPO_ROOT  = SCHEME_DIR.parent
+
+
+@pytest.fixture
+def elsewhere(tmp_path, monkeypatch):
+    """Run from an unrelated directory with neither the repo nor its schemes importable."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "path", [p for p in sys.path
+                                      if p not in ("", ".") and Path(p).resolve() not in (REPO_ROOT, SCHEME_DIR)])
+    for name in ("neo_rawio_chunked", "mapping_schemes", "mapping_schemes.neo_rawio_chunked"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    return tmp_path
+
+
+@pytest.mark.parametrize("sparc_id", [316, 435, 436])
+def test_scheme_imports_sibling_helper_from_any_cwd(elsewhere, sparc_id):
+    registry = DescriptorRegistry(SCHEME_DIR)
+
+    descriptors = registry.candidates(".rhd", sparc_id=sparc_id)
+
+    assert [d["sparc_id"] for d in descriptors] == [sparc_id]
+    assert "neo_rawio_chunked" in sys.modules
@@ -0,0 +1,44 @@
+"""
+`_ScratchBudget`: back-pressure on raw downloads held on the scratch disk.
+"""
+from collections import namedtuple
+
+import pytest
+
+from sparcfuse import sparc_fuse_core
+from sparcfuse.sparc_fuse_core import _ScratchBudget
+
+_Usage = namedtuple("_Usage", "total used free")
+
+
+@pytest.fixture
+def free_bytes(monkeypatch):
+    """Pretend the scratch filesystem has 1000 bytes free."""
+    monkeypatch.setattr(sparc_fuse_core.shutil, "disk_usage",
+                        lambda path: _Usage(10_000, 9_000, 1_000))
+    return 1_000
+
+
+def test_oversized_file_passes_budget_when_nothing_is_held(tmp_path):
+    budget = _ScratchBudget(100, tmp_path)
+
+    budget.acquire(500)
+
+    assert budget.used == 500
+
+
+def test_free_space_floor_applies_when_nothing_is_held(tmp_path, free_bytes):
+    budget = _ScratchBudget(None, tmp_path, min_free_bytes=600)
+
+    budget.acquire(300)
+    budget.release(300)
+    with pytest.raises(RuntimeError, match="min_free_bytes=600"):
+        budget.acquire(500)
+    assert budget.used == 0
+
+
+def test_free_space_floor_waits_while_something_is_held(tmp_path, free_bytes):
+    budget = _ScratchBudget(None, tmp_path, min_free_bytes=600)
+    budget.acquire(300)
+
+    assert not budget._fits(500)
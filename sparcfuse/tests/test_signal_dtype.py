@@ -0,0 +1,32 @@
+"""
+Integer ``signal_dtype`` keeps raw samples raw and refuses to truncate
+physical-unit float signals.
+"""
+import numpy as np
+import pytest
+import zarr
+
+from sparcfuse.utils import open_signals, save_standardized_output
+
+DESCRIPTOR = {"id": "test", "format": "test"}
+
+
+def test_integer_dtype_rejects_unscaled_float_signals(tmp_path):
+    result = {"signals": np.array([[0.25, -1.75, 3.5]]), "sampling_frequency": 10.0}
+
+    for file_format in ("npz", "zarr"):
+        with pytest.raises(ValueError, match="truncate"):
+            save_standardized_output(tmp_path / "out", result, DESCRIPTOR,
+                                     file_format=file_format, signal_dtype="i2")
+
+
+def test_integer_dtype_keeps_scaled_raw_samples(tmp_path):
+    raw = np.array([[1, -7, 14]], dtype="i2")
+    result = {"signals": raw, "sampling_frequency": 10.0,
+              "scale_factor": [0.25], "add_offset": [0.0]}
+
+    save_standardized_output(tmp_path / "out", result, DESCRIPTOR,
+                             file_format="zarr", signal_dtype="i2")
+
+    signals = open_signals(zarr.open_group(str(tmp_path / "out.zarr"), mode="r"))
+    np.testing.assert_array_equal(signals[:], raw * 0.25)
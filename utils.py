@@ -1,11 +1,23 @@
 # ── standard library ────────────────────────────────────────────────────
 from __future__ import annotations 
+import ast
+import codecs
 import glob
+import hashlib
 import importlib
 import importlib.util
 import json
+import multiprocessing
+import multiprocessing.connection
 import os
+import pickle
+import re
+import sys
 import textwrap
+import threading
+import time
+import warnings
+from collections.abc import MutableMapping
 from datetime import datetime
 from pathlib import Path
 
@@ -13,10 +25,231 @@ from pathlib import Path
 import matplotlib.pyplot as plt
 import numpy as np
 import zarr
+from numcodecs import Blosc, Delta
 from zarr import DirectoryStore, ZipStore
 from scipy.io import savemat
 
 
+def _resolve_closer(spec):
+    """A descriptor's ``parser["close"]``: a callable, a dotted name ("os.close") or a method name."""
+    if spec is None or callable(spec):
+        return spec
+    if "." in spec:
+        module, _, name = spec.rpartition(".")
+        return getattr(importlib.import_module(module), name)
+    return lambda obj: getattr(obj, spec)()
+
+
+class ParserSession:
+    """
+    A file opened with one descriptor's parser, as a context manager.
+
+    ``context`` holds the parser output (under ``output_var``) and the
+    ``filepath``. `close` releases what the parser opened – the output via
+    the descriptor's optional ``parser["close"]`` (a callable, a dotted name
+    such as ``"os.close"`` for raw descriptors, or a method name), otherwise
+    via its ``close()`` if it has one, and the parser instance of class-based
+    descriptors – and drops the references so memory maps can be freed.
+    """
+
+    def __init__(self, descriptor, filepath):
+        parser = descriptor['parser']
+        self.descriptor = descriptor
+        self.context = {}
+        self._handles = []               # (object, closer) in opening order
+        try:
+            mod = importlib.import_module(parser['module'])
+
+            if 'class' in parser:
+                cls = getattr(mod, parser['class'])
+                init_args = {
+                    k: (filepath if v == '<filepath>' else v)
+                    for k, v in parser['init_args'].items()
+                }
+                obj = cls(**init_args)
+                self._handles.append((obj, None))
+                load_method = getattr(obj, parser['load_method'])
+                output = load_method()
+            elif 'function' in parser:
+                func = getattr(mod, parser['function'])
+                args = [
+                    filepath if arg == '<filepath>' else arg
+                    for arg in parser.get('args', [])
+                ]
+                kwargs = {
+                    k: v for k, v in parser.get('kwargs', {}).items()
+                }
+                output = func(*args, **kwargs)
+            else:
+                raise ValueError("Descriptor must specify either 'class' or 'function'.")
+
+            if not any(output is h for h, _ in self._handles):
+                self._handles.append((output, _resolve_closer(parser.get('close'))))
+            self.context = {parser['output_var']: output, 'filepath': filepath}
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        while self._handles:
+            obj, closer = self._handles.pop()
+            try:
+                if closer is not None:
+                    closer(obj)
+                elif callable(getattr(obj, "close", None)):
+                    obj.close()
+            except Exception as e:
+                print(f"[WARN] Closing {type(obj).__name__} of {self.descriptor.get('id')} failed: {e}")
+        self.context.clear()
+
+    @classmethod
+    def empty(cls, descriptor):
+        """A session with nothing open, for a result mapped elsewhere (see `match_best_mapping`)."""
+        session = cls.__new__(cls)
+        session.descriptor = descriptor
+        session.context = {}
+        session._handles = []
+        return session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SignalBlocks:
+    """
+    Signals of a streaming descriptor, produced block by block.
+
+    A descriptor may define ``parser["stream"](output, filepath)`` instead of
+    a postprocess; it returns ``(header, blocks)`` where *header* holds the
+    usual result fields except ``signals``/``time`` (plus ``n_channels`` and,
+    if known, ``n_samples``) and *blocks* yields ``(t0, block)`` – the time in
+    seconds of the block's first sample and a (n_channels, n_block_samples)
+    array. The result's ``signals`` is then a SignalBlocks, which
+    `save_standardized_output` writes block by block, so the recording never
+    has to fit in memory. It can be iterated once, while the parser is open.
+
+    Blocks may hold raw samples when the header gives per-channel
+    ``scale_factor`` (and ``add_offset``); the writer then scales them or keeps
+    them raw depending on its ``signal_dtype``.
+
+    The header may also carry ``streams``: further signal streams of the file
+    (e.g. auxiliary inputs at another rate), each a header of its own with
+    its ``blocks``; they end up in the result as ``streams[name]``.
+    """
+
+    def __init__(self, blocks, *, n_channels, n_samples=None):
+        self._blocks = blocks
+        self.n_channels = int(n_channels)
+        self.n_samples = n_samples
+
+    def __iter__(self):
+        blocks, self._blocks = self._blocks, None
+        if blocks is None:
+            raise RuntimeError("SignalBlocks can only be iterated once")
+        return iter(blocks)
+
+    def __len__(self):
+        return self.n_channels
+
+    def materialize(self, sampling_frequency=None):
+        """Concatenate all blocks; returns (time, signals), time None without a sampling frequency."""
+        times, parts = [], []
+        for t0, block in self:
+            block = np.asarray(block)
+            parts.append(block)
+            if sampling_frequency:
+                times.append(t0 + np.arange(block.shape[1]) / sampling_frequency)
+        signals = np.concatenate(parts, axis=1) if parts else np.empty((self.n_channels, 0))
+        time = np.concatenate(times) if times else None
+        return time, signals
+
+
+class ScaledSignals:
+    """
+    Read-side view of a stored ``signals`` array kept as raw samples with
+    per-channel ``scale_factor``/``add_offset`` (CF style). Indexing reads
+    only the requested slice and returns it in physical units
+    (``raw * scale_factor + add_offset``), so the full recording is never
+    converted up front.
+    """
+
+    def __init__(self, raw, scale_factor, add_offset=None, dtype="f8"):
+        self.raw = raw
+        self.scale_factor = np.asarray(scale_factor, dtype="f8")
+        self.add_offset = (np.zeros_like(self.scale_factor) if add_offset is None
+                           else np.asarray(add_offset, dtype="f8"))
+        self.dtype = np.dtype(dtype)
+
+    @property
+    def shape(self):
+        return self.raw.shape
+
+    @property
+    def ndim(self):
+        return len(self.raw.shape)
+
+    def __len__(self):
+        return self.raw.shape[0]
+
+    def __getitem__(self, key):
+        channels = key[0] if isinstance(key, tuple) else key
+        scale, offset = self.scale_factor[channels], self.add_offset[channels]
+        data = np.asarray(self.raw[key], dtype=self.dtype)
+        if data.ndim > np.ndim(scale):          # time axis kept: scale per row
+            scale, offset = scale[..., None], offset[..., None]
+        return data * scale + offset
+
+
+def open_signals(group, name="signals"):
+    """
+    The ``signals`` array of an opened output group, as a `ScaledSignals`
+    if it was stored as raw samples, else the array itself.
+    """
+    arr = group[name]
+    if "scale_factor" in arr.attrs:
+        return ScaledSignals(arr, arr.attrs["scale_factor"], arr.attrs.get("add_offset"))
+    return arr
+
+
+def _signal_converter(signal_dtype, scale_factor=None, add_offset=None):
+    """
+    How signals are stored under *signal_dtype* ("native" keeps their dtype).
+
+    Raw samples (given with per-channel *scale_factor*/*add_offset*) are
+    scaled to physical units for float outputs and kept raw for "native" and
+    integer outputs. Returns ``(convert, attrs)``: *convert* maps a
+    (n_channels, n) array to what is written, *attrs* holds the scaling a
+    reader has to apply (empty when the stored values are physical).
+
+    *convert* raises ValueError for float signals without a scale under an
+    integer *signal_dtype*: casting would truncate them, and there is no
+    scaling to record that would undo it.
+    """
+    out = None if signal_dtype in (None, "native") else np.dtype(signal_dtype)
+    scaled = scale_factor is not None
+    if scaled:
+        scale = np.asarray(scale_factor, dtype="f8")[:, None]
+        offset = (np.zeros_like(scale) if add_offset is None
+                  else np.asarray(add_offset, dtype="f8")[:, None])
+    keep_raw = scaled and (out is None or out.kind in "iu")
+
+    def convert(block):
+        block = np.asarray(block)
+        if not scaled and out is not None and out.kind in "iu" and block.dtype.kind in "fc":
+            raise ValueError(f"signal_dtype {out} would truncate {block.dtype} signals "
+                             "that carry no scale_factor; use a float dtype or 'native'")
+        if scaled and not keep_raw:
+            block = block * scale + offset
+        return block if out is None else block.astype(out, copy=False)
+
+    attrs = ({"scale_factor": scale.ravel().tolist(), "add_offset": offset.ravel().tolist()}
+             if keep_raw else {})
+    return convert, attrs
+
+
 def load_file_with_descriptor(descriptor, filepath):
     """
     Loads a file using a parser specified by a descriptor.
@@ -45,39 +278,71 @@ def load_file_with_descriptor(descriptor, filepath):
 
     Raises:
         ValueError: If neither 'class' nor 'function' is specified in the descriptor.
+
+    .. deprecated::
+        The files opened by the parser are never released. Use `ParserSession`
+        as a context manager instead, which closes them on exit.
     """
-    mod = importlib.import_module(descriptor['parser']['module'])
+    # deprecated: nothing ever closed what the parser opened
+    warnings.warn("load_file_with_descriptor leaves the parser's files open; use "
+                  "`with ParserSession(descriptor, filepath) as session:` and "
+                  "session.context instead", DeprecationWarning, stacklevel=2)
+    return dict(ParserSession(descriptor, filepath).context)
 
-    if 'class' in descriptor['parser']:
-        cls = getattr(mod, descriptor['parser']['class'])
-        init_args = {
-            k: (filepath if v == '<filepath>' else v)
-            for k, v in descriptor['parser']['init_args'].items()
-        }
-        obj = cls(**init_args)
-        load_method = getattr(obj, descriptor['parser']['load_method'])
-        output = load_method()
-    elif 'function' in descriptor['parser']:
-        func = getattr(mod, descriptor['parser']['function'])
-        args = [
-            filepath if arg == '<filepath>' else arg
-            for arg in descriptor['parser'].get('args', [])
-        ]
-        kwargs = {
-            k: v for k, v in descriptor['parser'].get('kwargs', {}).items()
-        }
-        output = func(*args, **kwargs)
-    else:
-        raise ValueError("Descriptor must specify either 'class' or 'function'.")
+def compile_mapping(descriptor):
+    """
+    Compile the expressions of a descriptor's ``mapping`` (fields, metadata and
+    annotations) to code objects once and keep them on the descriptor under
+    ``_compiled_mapping``, for `evaluate_mapping_fields` to reuse on every file.
+
+    Returns:
+        list[str]: Syntax errors found. The affected expressions are kept as
+        None and evaluate like a failing expression (field None, annotation
+        dropped), so they are reported here once instead of per file.
+    """
+    errors = []
+
+    def _compile(expr, label):
+        if not isinstance(expr, str):
+            return None
+        try:
+            return compile(textwrap.dedent(expr).strip(), f"<{descriptor.get('id')}:{label}>", "eval")
+        except SyntaxError as e:
+            errors.append(f"{label}: {e.msg}")
+            return None
+
+    compiled = {}
+    for key, expr in descriptor.get('mapping', {}).items():
+        if key == 'metadata' or key == 'annotations':
+            if isinstance(expr, dict):  # metadata
+                compiled[key] = {mkey: _compile(mexpr, f"{key}.{mkey}") for mkey, mexpr in expr.items()}
+            elif isinstance(expr, list):  # annotations
+                compiled[key] = [
+                    {field: _compile(val, f"{key}[{i}].{field}") for field, val in annot.items()}
+                    if isinstance(annot, dict) else None
+                    for i, annot in enumerate(expr)
+                ]
+            else:
+                compiled[key] = expr
+        else:
+            compiled[key] = _compile(expr, key)
+
+    descriptor['_compiled_mapping'] = compiled
+    return errors
+
+
+def _eval_compiled(code, context):
+    if code is None:
+        raise ValueError("expression did not compile")
+    return eval(code, {}, context)
 
-    return {descriptor['parser']['output_var']: output, 'filepath': filepath}
 
 def evaluate_mapping_fields(descriptor, context):
     """
     Evaluates mapping expressions defined in a descriptor using the provided context.
 
     This function processes the 'mapping' field of the descriptor, evaluating each expression
-    (as a string) in the context of the given variables. It supports special handling for
+    (compiled once per descriptor by `compile_mapping`) in the context of the given variables. It supports special handling for
     'metadata' (dict of expressions) and 'annotations' (list of dicts of expressions).
     For other keys, the expression is evaluated directly.
 
@@ -96,31 +361,34 @@ def evaluate_mapping_fields(descriptor, context):
             'metadata' and 'annotations' if present. If 'time' was auto-generated, this is
             indicated in the 'metadata' under 'time_auto_generated'.
     """
+    compiled = descriptor.get('_compiled_mapping')
+    if compiled is None:
+        compile_mapping(descriptor)
+        compiled = descriptor['_compiled_mapping']
+
     results = {}
-    for key, expr in descriptor['mapping'].items():
+    for key, code in compiled.items():
         if key == 'metadata' or key == 'annotations':
             results[key] = {}
-            if isinstance(expr, dict):  # metadata
-                for mkey, mexpr in expr.items():
+            if isinstance(code, dict):  # metadata
+                for mkey, mcode in code.items():
                     try:
-                        cleaned_expr = textwrap.dedent(mexpr).strip()
-                        results[key][mkey] = eval(cleaned_expr, {}, context)
+                        results[key][mkey] = _eval_compiled(mcode, context)
                     except Exception:
                         results[key][mkey] = None
-            elif isinstance(expr, list):  # annotations
+            elif isinstance(code, list):  # annotations
                 results[key] = []
-                for annot in expr:
+                for annot in code:
                     try:
                         results[key].append({
-                            field: eval(textwrap.dedent(val).strip(), {}, context)
-                            for field, val in annot.items()
+                            field: _eval_compiled(fcode, context)
+                            for field, fcode in annot.items()
                         })
                     except Exception:
                         continue
         else:
             try:
-                cleaned_expr = textwrap.dedent(expr).strip()
-                results[key] = eval(cleaned_expr, {}, context)
+                results[key] = _eval_compiled(code, context)
             except Exception:
                 results[key] = None
 
@@ -146,73 +414,720 @@ def score_mapping_result(result, descriptor):
         int: The number of required fields present (not None) in the result.
     """
     required = descriptor.get('validation', {}).get('required_fields', [])
+    # streamed signals carry their time axis in the blocks
+    streamed = isinstance(result.get('signals'), SignalBlocks)
     score = 0
     for field in required:
         value = result.get(field)
-        if value is not None:
+        if value is not None or (streamed and field == 'time'):
             score += 1
     return score
 
 
-def match_best_mapping(descriptors, filepath, sparc_id=None):
+def max_mapping_score(descriptor):
+    """Highest score `score_mapping_result` can give for *descriptor*."""
+    return len(descriptor.get('validation', {}).get('required_fields', []))
+
+
+class FileSniff:
+    """
+    Cheap, cached look at a file that all candidate probes share: the first
+    bytes, the header line of a delimited text file, HDF5 object paths and
+    MAT-file variable names. Nothing is read until a probe asks for it.
+    """
+
+    def __init__(self, filepath, header_bytes=64 * 1024):
+        self.filepath = str(filepath)
+        self.header_bytes = header_bytes
+        self._head = None
+        self._columns = {}
+        self._hdf5 = {}
+        self._mat_vars = None
+
+    def head(self):
+        """The first *header_bytes* bytes of the file."""
+        if self._head is None:
+            with open(self.filepath, "rb") as fh:
+                self._head = fh.read(self.header_bytes)
+        return self._head
+
+    def csv_columns(self, encoding="utf-8", sep=","):
+        """Stripped column names from the first line, or [] if it cannot be decoded."""
+        key = (encoding, sep)
+        if key not in self._columns:
+            try:
+                text = self.head().decode(encoding, errors="ignore")
+                first = text.lstrip("\ufeff").splitlines()[0] if text.strip() else ""
+                self._columns[key] = [c.strip().strip('"').strip() for c in first.split(sep or ",")]
+            except (LookupError, IndexError):
+                self._columns[key] = []
+        return self._columns[key]
+
+    def fingerprint(self):
+        """
+        Short hash of what identifies the file's layout rather than its
+        content: the first line of a text file (its column header, with
+        digits masked so header-less numeric files of one shape agree), or
+        the leading signature bytes of a binary one.
+        """
+        head = self.head()
+        if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            lines = head.decode("utf-16", errors="ignore").splitlines()
+        elif b"\x00" not in head[:1024]:
+            lines = head.decode("utf-8", errors="ignore").splitlines()
+        else:
+            lines = [head[:16].hex()]
+        signature = re.sub(r"\d+", "0", lines[0]) if lines else ""
+        return hashlib.sha1(signature.encode("utf-8")).hexdigest()[:16]
+
+    def hdf5_has(self, path):
+        """True if *path* names a group/dataset in the file (False if not HDF5)."""
+        if path not in self._hdf5:
+            try:
+                import h5py
+                with h5py.File(self.filepath, "r") as f:
+                    self._hdf5[path] = path in f
+            except Exception:
+                self._hdf5[path] = False
+        return self._hdf5[path]
+
+    def mat_vars(self):
+        """Variable names of a MAT file (v4–v7 via whosmat, v7.3 via its HDF5 root)."""
+        if self._mat_vars is None:
+            try:
+                from scipy.io import whosmat
+                self._mat_vars = {name for name, _shape, _cls in whosmat(self.filepath)}
+            except Exception:
+                try:
+                    import h5py
+                    with h5py.File(self.filepath, "r") as f:
+                        self._mat_vars = set(f.keys())
+                except Exception:
+                    self._mat_vars = set()
+        return self._mat_vars
+
+
+def probe_descriptor(descriptor, sniff):
+    """
+    Score how likely *descriptor* is to parse the sniffed file, without loading it.
+
+    A descriptor may carry an optional ``probe``: either a callable taking the
+    `FileSniff` and returning a score in [0, 1], or a dict of any of
+
+        "magic":     bytes or list of bytes the file must start with
+        "columns":   header names of a delimited text file (read with the
+                     parser's ``encoding``/``sep`` kwargs)
+        "hdf5_keys": group/dataset paths that must exist
+        "mat_vars":  MAT-file variable names that must exist
+
+    Returns:
+        float | None: 0.0 rejects the candidate, 1.0 is a full match, partial
+        matches rank in between; None if the descriptor has no (usable) probe.
+    """
+    probe = descriptor.get("probe")
+    if probe is None:
+        return None
+    try:
+        if callable(probe):
+            return float(probe(sniff))
+
+        magic = probe.get("magic")
+        if magic is not None:
+            magics = (magic,) if isinstance(magic, bytes) else tuple(magic)
+            if not sniff.head().startswith(magics):
+                return 0.0
+
+        hits = []
+        if "columns" in probe:
+            kwargs = descriptor.get("parser", {}).get("kwargs", {})
+            columns = sniff.csv_columns(encoding=kwargs.get("encoding", "utf-8"),
+                                        sep=kwargs.get("sep", ","))
+            hits += [c in columns for c in probe["columns"]]
+        if "hdf5_keys" in probe:
+            hits += [sniff.hdf5_has(k) for k in probe["hdf5_keys"]]
+        if "mat_vars" in probe:
+            names = sniff.mat_vars()
+            hits += [v in names for v in probe["mat_vars"]]
+        return sum(hits) / len(hits) if hits else 1.0
+    except Exception as e:
+        print(f"[WARN] Probe of {descriptor.get('id')} failed: {e}")
+        return None
+
+
+def rank_candidates(candidates, filepath, sniff=None):
+    """
+    Order candidate descriptors into tiers using their probes.
+
+    Returns a list of tiers, best first: the descriptors sharing the highest
+    positive probe score; then partial matches and descriptors without a
+    probe; then those the probe rejected. Without any probes this is a
+    single tier holding every candidate, i.e. the exhaustive search.
+    """
+    sniff = sniff or FileSniff(filepath)
+    scored = [(probe_descriptor(d, sniff), d) for d in candidates]
+
+    top = max((p for p, _ in scored if p), default=None)
+    if top is None:
+        tiers = [[d for p, d in scored if p is None],
+                 [d for p, d in scored if p is not None]]
+    else:
+        rest = sorted(((p, d) for p, d in scored if p != top and p != 0.0),
+                      key=lambda pd: -(pd[0] or 0.0))
+        tiers = [[d for p, d in scored if p == top],
+                 [d for _, d in rest],
+                 [d for p, d in scored if p == 0.0]]
+    return [t for t in tiers if t]
+
+
+class MappingCache:
+    """
+    Remembers which descriptor mapped a kind of file – keyed by sparc_id,
+    extension and `FileSniff.fingerprint` – so the other files of a dataset go
+    straight to it instead of searching all candidates again.
+
+    Entries live in memory and, when *path* is given, in a small JSON file
+    (e.g. next to the converted outputs) shared by later runs and by worker
+    processes; concurrent writers merge, the last one wins per key.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self._entries = {}
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self._entries.update(self._read())
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @staticmethod
+    def key(sparc_id, file_ext, sniff):
+        return f"{sparc_id}|{file_ext.lower()}|{sniff.fingerprint()}"
+
+    def get(self, key):
+        """The cached ``{"descriptor_id", "score"}`` for *key*, or None."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key, descriptor_id, score):
+        entry = {"descriptor_id": descriptor_id, "score": score}
+        with self._lock:
+            if self._entries.get(key) == entry:
+                return
+            self._entries[key] = entry
+            if self.path is None:
+                return
+            merged = self._read()
+            merged.update(self._entries)
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp, "w", encoding="utf-8") as fh:
+                    json.dump(merged, fh, indent=1, sort_keys=True)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"[WARN] Could not write mapping cache {self.path}: {e}")
+
+
+def _cached_candidate(candidates, descriptor_id, file_ext):
+    """The candidate with *descriptor_id* (ids are not unique across schemes,
+    so prefer the one handling *file_ext*)."""
+    matches = [d for d in candidates if d.get('id') == descriptor_id]
+    for d in matches:
+        if file_ext in _descriptor_formats(d):
+            return d
+    return matches[0] if matches else None
+
+
+def _streamed_result(header, blocks):
+    """Result of a streaming descriptor: *header* with its blocks (and those of any further streams) as SignalBlocks."""
+    result = {k: v for k, v in header.items() if k != "blocks"}
+    result["signals"] = SignalBlocks(
+        blocks,
+        n_channels=header.get("n_channels", len(header.get("channel_names") or [])),
+        n_samples=header.get("n_samples"),
+    )
+    result.setdefault("time", None)
+    if header.get("streams"):
+        result["streams"] = {name: _streamed_result(stream, stream["blocks"])
+                             for name, stream in header["streams"].items()}
+    return result
+
+
+def _materialize_result(result):
+    """Read the SignalBlocks of a streamed result (and its further streams) into memory, in place."""
+    for part in (result, *(result.get("streams") or {}).values()):
+        if isinstance(part.get("signals"), SignalBlocks):
+            part["time"], part["signals"] = part["signals"].materialize(part.get("sampling_frequency"))
+    return result
+
+
+def _evaluate_candidate(desc, filepath, *, keep_open=False):
+    """
+    Fully load *filepath* with *desc* and map it; returns (result, score, session).
+    The parser's handles are released before returning (or on failure)
+    unless *keep_open*, in which case the caller closes *session*.
+    """
+    session = ParserSession(desc, filepath)
+    try:
+        context = session.context
+        output = context[desc["parser"]["output_var"]]
+
+        # A streaming descriptor only reads its header here; the blocks are
+        # pulled while saving. Otherwise use the postprocess function if
+        # defined, else eval the mapping
+        stream_fn = desc['parser'].get("stream", None)
+        postprocess_fn = desc['parser'].get("postprocess", None)
+        if callable(stream_fn):
+            header, blocks = stream_fn(output, context.get("filepath"))
+            result = _streamed_result(header, blocks)
+        elif callable(postprocess_fn):
+            result = postprocess_fn(output, context.get("filepath"))
+        else:
+            result = evaluate_mapping_fields(desc, context)
+        score = score_mapping_result(result, desc)
+    except BaseException:
+        session.close()
+        raise
+    if not keep_open:
+        session.close()
+    return result, score, session
+
+
+def _descriptor_formats(descriptor):
+    """Lower-cased extensions a descriptor handles ('format' may be a str or a tuple)."""
+    fmt = descriptor.get('format') or ()
+    if isinstance(fmt, str):
+        fmt = (fmt,)
+    return tuple(f.lower() for f in fmt if isinstance(f, str))
+
+
+_RSS_POLL_INTERVAL = 0.2   # seconds between resident-memory checks of candidate workers
+
+
+def _mp_context():
+    # forkserver/spawn: the pipeline calls this from threads, where fork is unsafe.
+    # The fork server imports this module once, so candidate workers forked
+    # from it start with it (numpy, zarr, matplotlib, …) already loaded
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload([__name__])
+    return ctx
+
+
+def _process_rss(pid):
+    """Resident memory of process *pid* in bytes, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm", "r") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _candidate_worker(conn, source_file, filepath, address_space_limit):
+    """
+    Child process: load one scheme from its source, score it on *filepath* and
+    report the score. The parent then either stops the child or asks for the
+    mapped result, which is sent back – or "reopen" when it cannot cross the
+    process boundary (streamed signals, open file handles) and has to be
+    loaded again by the parent.
+    """
+    try:
+        if address_space_limit:
+            try:
+                import resource
+                resource.setrlimit(resource.RLIMIT_AS, (int(address_space_limit), int(address_space_limit)))
+            except (ImportError, ValueError, OSError):
+                pass                     # no address-space limits on this platform
+        desc = _exec_scheme(source_file)
+        result, score, _session = _evaluate_candidate(desc, filepath)
+        conn.send(("ok", score))
+        if conn.recv() != "result":
+            return
+        if callable(desc["parser"].get("stream")):
+            conn.send(("reopen", None))  # the blocks are read from the file while saving
+            return
+        try:
+            conn.send(("result", result))
+        except (TypeError, AttributeError, pickle.PicklingError):
+            conn.send(("reopen", None))  # e.g. h5py datasets
+    except EOFError:
+        pass                             # the parent stopped waiting for this candidate
+    except MemoryError:
+        conn.send(("memory", f"exceeded memory limit of {address_space_limit} bytes"))
+    except BaseException as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def _score_candidates_parallel(candidates, filepath, *, workers, timeout=None,
+                               memory_limit=None, exhaustive=False):
+    """
+    Map *filepath* with *candidates* in up to *workers* child processes and
+    bring the winner's result back.
+
+    Each child re-loads its scheme from ``_source_file`` (descriptors hold
+    unpicklable post-processing functions) and first reports only its score.
+    The best candidate so far is kept waiting while the others are stopped;
+    once all are scored it sends its result, so only the winner's arrays
+    cross the process boundary and no file is parsed twice. A child running
+    longer than *timeout* seconds (scoring, and again sending its result), or
+    whose resident memory grows beyond *memory_limit* bytes, is killed (where
+    resident memory cannot be read the child's address space is capped
+    instead). Once a candidate reaches its maximum score, the candidates
+    after it are cancelled (unless *exhaustive*) – those before it still
+    finish, so the winner is the same as in a sequential search. If the
+    winner fails to send its result, the remaining scored candidates are run
+    again.
+
+    Returns:
+        tuple: ``(outcomes, winner)``. *outcomes* holds one
+        (descriptor, score, error, limit) per candidate, in the order given;
+        *limit* is "timeout" or "memory" when the candidate was stopped by one.
+        *winner* is ``(index, result)`` for the best candidate, with *result*
+        None when it has to be loaded in this process (see `_candidate_worker`),
+        or None if no candidate succeeded.
+    """
+    ctx = _mp_context()
+    watch_rss = bool(memory_limit) and _process_rss(os.getpid()) is not None
+    address_space_limit = None if watch_rss else memory_limit
+    outcomes = [(desc, None, "cancelled", None) for desc in candidates]
+    queue = list(range(len(candidates)))
+    running = {}                       # connection -> (process, index, started)
+    held = None                        # (connection, process, index, score) of the best so far
+
+    def _stop(conn, proc):
+        if proc.is_alive():
+            proc.terminate()
+        proc.join()
+        conn.close()
+
+    def _exceeded(proc, started):
+        """The limit *proc* ran into, with its error message, or None."""
+        if timeout and time.monotonic() - started >= timeout:
+            return "timeout", f"timed out after {timeout}s"
+        if watch_rss and (_process_rss(proc.pid) or 0) > memory_limit:
+            return "memory", f"exceeded memory limit of {memory_limit} bytes"
+        return None
+
+    def _receive(conn, proc):
+        try:
+            return conn.recv()
+        except EOFError:                 # killed (e.g. by the OOM killer) before reporting
+            proc.join()
+            return "error", f"worker exited with code {proc.exitcode}"
+
+    def _hold(conn, proc, idx, score):
+        """Keep the better of *idx* and the held candidate waiting; ties go to the earlier one."""
+        nonlocal held
+        if held is None or (score, -idx) > (held[3], -held[2]):
+            if held is not None:
+                _stop(held[0], held[1])
+            held = (conn, proc, idx, score)
+        else:
+            _stop(conn, proc)
+
+    try:
+        while True:
+            while queue or running:
+                while queue and len(running) < workers:
+                    idx = queue.pop(0)
+                    conn, child_conn = ctx.Pipe()
+                    proc = ctx.Process(
+                        target=_candidate_worker,
+                        args=(child_conn, candidates[idx]["_source_file"], str(filepath),
+                              address_space_limit),
+                        daemon=True,
+                    )
+                    proc.start()
+                    child_conn.close()
+                    running[conn] = (proc, idx, time.monotonic())
+
+                wait = _RSS_POLL_INTERVAL if watch_rss else None
+                if timeout:
+                    first_deadline = min(started for _p, _i, started in running.values()) + timeout
+                    wait = min(wait or timeout, max(0.0, first_deadline - time.monotonic()))
+                for conn in multiprocessing.connection.wait(list(running), timeout=wait):
+                    proc, idx, _started = running.pop(conn)
+                    status, value = _receive(conn, proc)
+                    desc = candidates[idx]
+                    if status != "ok":
+                        _stop(conn, proc)
+                        outcomes[idx] = (desc, None, value, "memory" if status == "memory" else None)
+                        continue
+                    outcomes[idx] = (desc, value, None, None)
+                    _hold(conn, proc, idx, value)
+                    if not exhaustive and value >= max_mapping_score(desc):
+                        queue = [i for i in queue if i < idx]
+                        for other, (p, i, _s) in list(running.items()):
+                            if i > idx:
+                                del running[other]
+                                _stop(other, p)
+
+                for conn, (proc, idx, started) in list(running.items()):
+                    hit = _exceeded(proc, started)
+                    if hit:
+                        outcomes[idx] = (candidates[idx], None, hit[1], hit[0])
+                        del running[conn]
+                        _stop(conn, proc)
+
+            if held is None:
+                return outcomes, None
+
+            # ---- the winner sends its result, under the same limits ------
+            conn, proc, idx, _score = held
+            held = None
+            started = time.monotonic()
+            status, value, limit = "error", None, None
+            try:
+                conn.send("result")
+                while True:
+                    if conn.poll(_RSS_POLL_INTERVAL if watch_rss or timeout else None):
+                        status, value = _receive(conn, proc)
+                        break
+                    hit = _exceeded(proc, started)
+                    if hit:
+                        limit, value = hit
+                        break
+            except OSError as e:             # the child is already gone
+                value = f"worker exited: {e}"
+            finally:
+                _stop(conn, proc)
+            if status in ("result", "reopen"):
+                return outcomes, (idx, value if status == "result" else None)
+
+            if status == "memory":
+                limit = "memory"
+            outcomes[idx] = (candidates[idx], None, value, limit)
+            # run the others again – including those cancelled in its favour
+            queue = [i for i, o in enumerate(outcomes) if o[1] is not None or o[2] == "cancelled"]
+            if not queue:
+                return outcomes, None
+    finally:
+        for conn, (proc, _idx, _started) in list(running.items()):
+            _stop(conn, proc)
+        if held is not None:
+            _stop(held[0], held[1])
+
+
+def match_best_mapping(descriptors, filepath, sparc_id=None, *, exhaustive=False, cache=None,
+                       workers=1, timeout=None, memory_limit=None, keep_open=False):
     """
     Attempts to find and apply the best mapping descriptor for a given file.
 
     The function selects candidate descriptors based on the provided SPARC ID or the file extension.
-    It then applies each candidate's parser to the file, optionally using a postprocess function if defined.
-    Each mapping result is scored, and the best-scoring result and its descriptor are returned.
+    Candidates that define a ``probe`` are first ranked cheaply (see `rank_candidates`); only the
+    best-ranked tier is fully loaded, and lower tiers are tried only if every candidate above them failed.
+    Each loaded candidate's parser is applied to the file, optionally using a postprocess function if defined.
+    Each mapping result is scored, and the best-scoring result and its descriptor are returned. The search
+    stops at the first candidate reaching its maximum score (`max_mapping_score`) unless ``exhaustive``.
 
     Args:
-        descriptors (list): A list of descriptor dictionaries, each describing how to parse and map a file.
+        descriptors (list | DescriptorRegistry): Descriptor dictionaries, each describing how to parse and map a file,
+            or a registry that imports only the candidate schemes.
         filepath (str): The path to the file to be mapped.
         sparc_id (str, optional): An optional SPARC ID to prioritize matching descriptors.
+        exhaustive (bool, optional): Load every candidate in every tier (for debugging descriptors).
+        cache (MappingCache, optional): Try the descriptor that mapped this kind of file before
+            (same sparc_id, extension and header fingerprint) first, and remember the winner.
+        workers (int, optional): Map a tier of several candidates in this many worker processes at
+            once (see `_score_candidates_parallel`); the winning worker sends its result back (streaming
+            descriptors, whose blocks are read while saving, are opened again in this process).
+        timeout (float, optional): Wall-clock seconds a candidate may run before it is killed.
+        memory_limit (int, optional): Resident memory in bytes a candidate may use before it is killed.
+            With either limit set, candidates are scored in worker processes even when ``workers`` is 1.
+        keep_open (bool, optional): Leave the winning parser open and return its `ParserSession` (to be
+            closed by the caller) – for results that still read from the file. Rejected candidates are
+            always closed as soon as they are scored.
 
     Returns:
         dict: A dictionary containing:
             - 'descriptor': The best-matching descriptor dictionary.
             - 'result': The result of applying the mapping.
             - 'score': The score of the best mapping result.
+            - 'candidates_tried': How many candidates were fully loaded.
+            - 'limits_hit': One ``{'descriptor_id', 'limit', 'error'}`` per candidate stopped by the
+              time ("timeout") or memory ("memory") limit.
+            - 'session': The winner's open `ParserSession` with ``keep_open``, else None.
     """
     file_ext = os.path.splitext(filepath)[1].lower()
 
-    # Prefer descriptors explicitly matching SPARC ID
-    if sparc_id is not None:
-        candidates = [d for d in descriptors if d.get('sparc_id') == sparc_id]
+    if isinstance(descriptors, DescriptorRegistry):
+        # only the candidate scheme modules get imported
+        candidates = descriptors.candidates(file_ext, sparc_id)
     else:
-        candidates = [d for d in descriptors if d.get('format', '').lower() == file_ext]
+        # Prefer descriptors explicitly matching SPARC ID, then the extension
+        candidates = []
+        if sparc_id is not None:
+            candidates = [d for d in descriptors if d.get('sparc_id') == sparc_id]
+        if not candidates:
+            candidates = [d for d in descriptors if file_ext in _descriptor_formats(d)]
 
-    if not candidates:
-        print(f"[WARN] No descriptor matched sparc_id={sparc_id} or file extension '{file_ext}', trying all...")
-        candidates = descriptors  # fallback to all
+        if not candidates:
+            print(f"[WARN] No descriptor matched sparc_id={sparc_id} or file extension '{file_ext}', trying all...")
+            candidates = descriptors  # fallback to all
 
     best_score = -1
     best_result = None
     best_descriptor = None
+    best_session = None
+    tried = 0
+    done = False
+    limits_hit = []
+    sniff = FileSniff(filepath)
+
+    def _keep(desc, result, score, session):
+        """Keep *desc*'s result if it is the best so far (its parser stays open only then)."""
+        nonlocal best_score, best_result, best_descriptor, best_session
+        if score > best_score:
+            if best_session is not None:
+                best_session.close()
+            best_score, best_result, best_descriptor, best_session = score, result, desc, session
+        else:
+            session.close()              # rejected: release its handles now
+        return score
+
+    def _evaluate(desc):
+        """Load and score *desc* in this process."""
+        return _keep(desc, *_evaluate_candidate(desc, filepath, keep_open=True))
+
+    def _isolate(tier):
+        # candidates run in worker processes to evaluate several at once or
+        # to enforce limits; the descriptors must be loadable from source
+        wanted = timeout or memory_limit or (workers > 1 and len(tier) > 1)
+        return bool(wanted) and all(d.get("_source_file") for d in tier)
+
+    def _run_isolated(tier):
+        """
+        Map *tier* in worker processes and keep the winner's result, which the
+        winning worker sends back. Winners that cannot send it (streamed
+        signals, open file handles) are loaded again here, falling back to the
+        runner-up if that fails.
+        """
+        nonlocal tried
+        outcomes, winner = _score_candidates_parallel(
+            tier, filepath, workers=workers, timeout=timeout,
+            memory_limit=memory_limit, exhaustive=exhaustive,
+        )
+        for desc, _score, err, limit in outcomes:
+            if err == "cancelled":
+                continue
+            tried += 1
+            if err:
+                print(f"[WARN] Mapping {desc['id']} failed: {err}")
+            if limit:
+                limits_hit.append({'descriptor_id': desc.get('id'), 'limit': limit, 'error': err})
+        if winner is None:
+            return
+        idx, result = winner
+        if result is not None:
+            desc, score = outcomes[idx][:2]
+            _keep(desc, result, score, ParserSession.empty(desc))
+            return
+        # best score first; ties go to the earlier candidate, as sequentially
+        ranked = sorted((o for o in outcomes if o[1] is not None), key=lambda o: -o[1])
+        for desc, *_ in ranked:
+            try:
+                _evaluate(desc)
+            except Exception as e:
+                print(f"[WARN] Mapping {desc['id']} failed: {e}")
+                continue
+            break
+
+    def _mapping():
+        if best_session is not None and not keep_open:
+            # streamed blocks need the parser open: read them in now
+            _materialize_result(best_result)
+            best_session.close()
+        return {
+            'descriptor': best_descriptor,
+            'result': best_result,
+            'score': best_score,
+            'candidates_tried': tried,
+            'limits_hit': limits_hit,
+            'session': best_session if keep_open else None,
+        }
 
-    for desc in candidates:
-        try:
-            context = load_file_with_descriptor(desc, filepath)
-
-            # If postprocess function is defined, use it instead of eval
-            postprocess_fn = desc['parser'].get("postprocess", None)
-            if callable(postprocess_fn):
-                result = postprocess_fn(context[desc["parser"]["output_var"]], context.get("filepath"))
+    # a descriptor that mapped this kind of file before is tried first and
+    # kept if it validates at least as well as it did then
+    cache_key = None
+    if cache is not None and not exhaustive:
+        cache_key = cache.key(sparc_id, file_ext, sniff)
+        known = cache.get(cache_key)
+        desc = _cached_candidate(candidates, known["descriptor_id"], file_ext) if known else None
+        if desc is not None:
+            if _isolate([desc]):
+                _run_isolated([desc])
             else:
-                result = evaluate_mapping_fields(desc, context)
-            score = score_mapping_result(result, desc)
-            if score > best_score:
-                best_score = score
-                best_result = result
-                best_descriptor = desc
-        except Exception as e:
-            print(f"[WARN] Mapping {desc['id']} failed: {e}")
-            continue
+                tried += 1
+                try:
+                    _evaluate(desc)
+                except Exception as e:
+                    print(f"[WARN] Mapping {desc['id']} failed: {e}")
+            if best_score > 0 and best_score >= known["score"]:
+                return _mapping()
+            print(f"[INFO] Cached mapping {desc['id']} did not validate for "
+                  f"{os.path.basename(filepath)}, searching all candidates")
+            candidates = [d for d in candidates if d is not desc]
+
+    # probe cheaply, then fully load only the best-ranked tier; lower tiers
+    # are tried only if every candidate above them failed
+    tiers = rank_candidates(candidates, filepath, sniff) if len(candidates) > 1 else [list(candidates)]
+
+    for tier in tiers:
+        if _isolate(tier):
+            _run_isolated(tier)
+        else:
+            for desc in tier:
+                tried += 1
+                try:
+                    score = _evaluate(desc)
+                except Exception as e:
+                    print(f"[WARN] Mapping {desc['id']} failed: {e}")
+                    continue
+                # nothing can beat a perfect score, unless debugging every candidate
+                if not exhaustive and score >= max_mapping_score(desc):
+                    done = True
+                    break
+        if done or (best_score > 0 and not exhaustive):
+            break
+
+    if cache_key is not None and best_descriptor is not None and best_score > 0:
+        cache.put(cache_key, best_descriptor.get('id'), best_score)
+
+    return _mapping()
+
+def _exec_scheme(file):
+    """
+    Execute a mapping scheme module and return its ``descriptor`` (None if it
+    has none), with its mapping compiled and its source recorded under
+    ``_source_file`` so worker processes can load it again.
+
+    The scheme's directory is put on ``sys.path`` so schemes can import the
+    helper modules that sit next to them (``from neo_rawio_chunked import ...``)
+    whatever the working directory.
+    """
+    scheme_dir = os.path.dirname(os.path.abspath(file))
+    if scheme_dir not in sys.path:
+        sys.path.append(scheme_dir)
+    module_name = os.path.splitext(os.path.basename(file))[0]
+    spec = importlib.util.spec_from_file_location(module_name, file)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    descriptor = getattr(mod, "descriptor", None)
+    if descriptor is not None:
+        descriptor.setdefault("_source_file", str(file))
+        for err in compile_mapping(descriptor):
+            print(f"[WARN] Descriptor {descriptor.get('id')} ({file}): invalid mapping {err}")
+    return descriptor
 
-    return {
-        'descriptor': best_descriptor,
-        'result': best_result,
-        'score': best_score
-    }
 
 def load_all_descriptors(directory="./mapping_schemes"):
     """
@@ -235,12 +1150,9 @@ def load_all_descriptors(directory="./mapping_schemes"):
 
     for file in py_files:
         try:
-            module_name = os.path.splitext(os.path.basename(file))[0]
-            spec = importlib.util.spec_from_file_location(module_name, file)
-            mod = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(mod)
-            if hasattr(mod, "descriptor"):
-                descriptors.append(mod.descriptor)
+            descriptor = _exec_scheme(file)
+            if descriptor is not None:
+                descriptors.append(descriptor)
         except Exception as e:
             print(f"[WARN] Failed to load descriptor from {file}: {e}")
 
@@ -248,9 +1160,514 @@ def load_all_descriptors(directory="./mapping_schemes"):
     return descriptors
 
 
+def _read_descriptor_header(file):
+    """
+    Statically read 'id', 'sparc_id' and 'format' of the module-level
+    ``descriptor = {...}`` in a mapping scheme, without executing it (and so
+    without importing neo, h5py, pandas, …).
+
+    Returns None if the file defines no descriptor, and a header with
+    ``static=False`` if the descriptor is not a dict literal (it is then
+    indexed after importing the module).
+    """
+    with open(file, "r", encoding="utf-8") as fh:
+        tree = ast.parse(fh.read(), filename=file)
+
+    node = None
+    for stmt in tree.body:
+        if (isinstance(stmt, ast.Assign)
+                and any(isinstance(t, ast.Name) and t.id == "descriptor" for t in stmt.targets)):
+            node = stmt.value            # last assignment wins, as on import
+    if node is None:
+        return None
+    if not isinstance(node, ast.Dict):
+        return {"source_file": file, "static": False}
+
+    header = {"source_file": file, "static": True}
+    for key, value in zip(node.keys, node.values):
+        if isinstance(key, ast.Constant) and key.value in ("id", "sparc_id", "format"):
+            try:
+                header[key.value] = ast.literal_eval(value)
+            except ValueError:
+                header["static"] = False
+    return header
+
+
+class DescriptorRegistry:
+    """
+    Lazily-loading index of the mapping schemes in *directory*.
+
+    Construction only parses the scheme sources (see `_read_descriptor_header`)
+    and indexes them by ``sparc_id`` and extension; a scheme module – and the
+    heavy parser libraries it imports – is executed the first time it becomes
+    a candidate for a file. Can be passed to `match_best_mapping` wherever a
+    list from `load_all_descriptors` is accepted; iterating it loads every scheme.
+    """
+
+    def __init__(self, directory="./mapping_schemes"):
+        self.directory = str(directory)
+        self.headers = []
+        self._by_sparc_id = {}
+        self._by_ext = {}
+        self._loaded = {}                # source_file -> descriptor (None = failed)
+        self._lock = threading.RLock()
+
+        for file in sorted(glob.glob(os.path.join(self.directory, "*.py"))):
+            try:
+                header = _read_descriptor_header(file)
+            except (OSError, SyntaxError) as e:
+                print(f"[WARN] Failed to read descriptor from {file}: {e}")
+                continue
+            if header is None:
+                continue
+            if not header["static"]:
+                desc = self.load(header)  # cannot index without importing
+                if desc is None:
+                    continue
+                header.update(id=desc.get("id"), sparc_id=desc.get("sparc_id"),
+                              format=desc.get("format"))
+            self._index(header)
+
+        print(f"[INFO] Indexed {len(self.headers)} descriptor(s) in {self.directory}")
+
+    def _index(self, header):
+        self.headers.append(header)
+        self._by_sparc_id.setdefault(header.get("sparc_id"), []).append(header)
+        for ext in _descriptor_formats(header):
+            self._by_ext.setdefault(ext, []).append(header)
+
+    def load(self, header):
+        """Import the scheme behind *header* (once) and return its descriptor, or None."""
+        file = header["source_file"]
+        with self._lock:
+            if file not in self._loaded:
+                try:
+                    self._loaded[file] = _exec_scheme(file)
+                except Exception as e:
+                    print(f"[WARN] Failed to load descriptor from {file}: {e}")
+                    self._loaded[file] = None
+            return self._loaded[file]
+
+    def _load_all(self, headers):
+        return [d for d in (self.load(h) for h in headers) if d is not None]
+
+    def candidates(self, file_ext, sparc_id=None):
+        """
+        Descriptors to try for a file: those registered for *sparc_id*, else
+        those handling *file_ext*, else (with a warning) every descriptor.
+        """
+        file_ext = file_ext.lower()
+        headers = self._by_sparc_id.get(sparc_id, []) if sparc_id is not None else []
+        if not headers:
+            headers = self._by_ext.get(file_ext, [])
+        if not headers:
+            print(f"[WARN] No descriptor matched sparc_id={sparc_id} or file extension '{file_ext}', trying all...")
+            headers = self.headers
+        return self._load_all(headers)
+
+    def __iter__(self):
+        return iter(self._load_all(self.headers))
+
+    def __len__(self):
+        return len(self.headers)
+
+
 # -------------------------------------------------------------------------
 # save_standardized_output
 # -------------------------------------------------------------------------
+_STREAM_CHUNK_SAMPLES = 65536   # samples per zarr chunk along time for streamed signals
+_CHUNK_BYTES = 4 * 2**20        # default target size of one automatic signals chunk
+_CHUNK_MAX_CHANNELS = 16        # channels sharing one automatic chunk
+_CHUNK_MIN_SAMPLES = 1024
+_BLOSC_CODECS = ("zstd", "lz4", "lz4hc", "blosclz", "zlib")
+_BLOSC_SHUFFLES = {"shuffle": Blosc.SHUFFLE, "bitshuffle": Blosc.BITSHUFFLE,
+                   "noshuffle": Blosc.NOSHUFFLE}
+_TIME_TOLERANCE = 1e-3          # deviation, in sample periods, still counted as regular sampling
+
+
+def _signal_chunks(spec, n_channels, n_samples, dtype, chunk_bytes=_CHUNK_BYTES):
+    """
+    Chunk shape for a (n_channels, n_samples) signals array: *spec* itself
+    unless it is "auto" (None leaves the choice to zarr).
+
+    The automatic policy is time-major: up to `_CHUNK_MAX_CHANNELS` channels
+    per chunk and as many samples as fit in *chunk_bytes* (a power of two,
+    at least `_CHUNK_MIN_SAMPLES`). A time window across a probe then
+    touches few chunks, and a single channel is read along with at most 15
+    neighbours instead of the whole array. When *n_samples* is known the
+    time extent is evened out over the chunks it needs (rounded up to
+    `_CHUNK_MIN_SAMPLES`), since zarr stores a partial last chunk at full size.
+    """
+    if isinstance(spec, str) and spec == "auto":
+        n_ch = max(1, min(int(n_channels), _CHUNK_MAX_CHANNELS))
+        fit = int(chunk_bytes) // (n_ch * np.dtype(dtype).itemsize)
+        n_t = max(_CHUNK_MIN_SAMPLES, 1 << max(0, fit.bit_length() - 1))
+        if n_samples:
+            n_chunks = -(-int(n_samples) // n_t)
+            per_chunk = -(-int(n_samples) // n_chunks)
+            n_t = min(n_t, -(-per_chunk // _CHUNK_MIN_SAMPLES) * _CHUNK_MIN_SAMPLES,
+                      int(n_samples))
+        return (n_ch, n_t)
+    return None if spec is None else tuple(spec)
+
+
+def _zarr_codecs(compression, dtype):
+    """
+    zarr ``compressor``/``filters`` for an array of *dtype* under *compression*:
+
+    • None                                  → zarr's default compressor
+    • "none"                                → stored uncompressed
+    • "<codec>[:<level>][:<shuffle>]"       → Blosc with codec zstd, lz4, lz4hc,
+      blosclz or zlib, level 1–9 (default 5) and shuffle "shuffle" (bytes,
+      default), "bitshuffle" or "noshuffle"
+
+    Appending "+delta" stores the differences between consecutive samples,
+    which compress far better for integer ADC data; it is skipped for other
+    dtypes, where it would not be lossless.
+    """
+    if compression is None:
+        return {}
+    spec, _, extra = str(compression).partition("+")
+    cname, level, shuffle = (spec.split(":") + [None, None])[:3]
+    if extra not in ("", "delta") or (cname != "none" and cname not in _BLOSC_CODECS) \
+            or (shuffle or "shuffle") not in _BLOSC_SHUFFLES:
+        raise ValueError(f"Unsupported compression: {compression!r}")
+
+    kwargs = {"compressor": None}
+    if cname != "none":
+        kwargs["compressor"] = Blosc(cname=cname, clevel=int(level or 5),
+                                     shuffle=_BLOSC_SHUFFLES[shuffle or "shuffle"])
+    if extra == "delta" and np.dtype(dtype).kind in "iu":
+        kwargs["filters"] = [Delta(dtype=np.dtype(dtype))]
+    return kwargs
+
+
+def _signal_array_kwargs(n_channels, n_samples, dtype, *, chunks="auto",
+                         chunk_bytes=_CHUNK_BYTES, compression=None, compressor=None):
+    """zarr creation kwargs (chunks, compressor, filters) of one signals array."""
+    kwargs = {"chunks": _signal_chunks(chunks, n_channels, n_samples, dtype, chunk_bytes)}
+    kwargs.update(_zarr_codecs(compression, dtype))
+    if compressor is not None:                 # an explicit codec instance wins
+        kwargs["compressor"] = compressor
+    return kwargs
+
+
+def _time_kwargs(sig, array_kwargs):
+    """Time arrays follow the signals' chunking along time and compressor (never delta-filtered)."""
+    kwargs = {"chunks": (sig.chunks[-1],)}
+    if "compressor" in array_kwargs:
+        kwargs["compressor"] = array_kwargs["compressor"]
+    return kwargs
+
+
+def _regular_time_start(time, sampling_frequency):
+    """Start of *time* if it is sampled regularly at *sampling_frequency*, else None."""
+    if not sampling_frequency or time.ndim != 1 or time.size == 0:
+        return None
+    expected = time[0] + np.arange(time.size) / sampling_frequency
+    if np.all(np.abs(time - expected) <= _TIME_TOLERANCE / sampling_frequency):
+        return float(time[0])
+    return None
+
+
+def _time_layout(time, sampling_frequency, n_samples, time_encoding="auto"):
+    """
+    How an in-memory time axis is stored. Returns ``(time, attrs)``: the
+    explicit array to write (None if there is none to write) and the
+    ``time_encoding`` metadata – "regular" with ``time_start`` and
+    ``n_samples`` (time is ``time_start + i / sampling_frequency``), or
+    "explicit". *time_encoding* "explicit" always keeps a given array.
+    """
+    if time is None:
+        if sampling_frequency:
+            return None, {"time_encoding": "regular", "time_start": 0.0, "n_samples": n_samples}
+        return None, {}
+    time = np.asarray(time, dtype="f8")
+    if time_encoding == "auto" and time.shape == (n_samples,):
+        t0 = _regular_time_start(time, sampling_frequency)
+        if t0 is not None:
+            return None, {"time_encoding": "regular", "time_start": t0, "n_samples": n_samples}
+    return time, {"time_encoding": "explicit"}
+
+
+class RegularTime:
+    """
+    Time axis of a regularly sampled output, rebuilt from its ``time_start``,
+    ``sampling_frequency`` and ``n_samples``; indexing computes only the
+    requested samples.
+    """
+
+    def __init__(self, time_start, sampling_frequency, n_samples):
+        self.time_start = float(time_start)
+        self.sampling_frequency = float(sampling_frequency)
+        self.n_samples = int(n_samples)
+        self.dtype = np.dtype("f8")
+
+    @property
+    def shape(self):
+        return (self.n_samples,)
+
+    def __len__(self):
+        return self.n_samples
+
+    def __getitem__(self, key):
+        index = range(self.n_samples)[key] if isinstance(key, (int, slice)) \
+            else np.arange(self.n_samples)[key]
+        if isinstance(index, range):
+            index = np.arange(index.start, index.stop, index.step)
+        return self.time_start + np.asarray(index) / self.sampling_frequency
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self[:], dtype=dtype)
+
+
+def open_time(group):
+    """
+    The time axis of an opened output group: its ``time`` array, a
+    `RegularTime` for regularly sampled outputs, or None.
+    """
+    if "time" in group:
+        return group["time"]
+    attrs = group.attrs
+    if attrs.get("time_encoding") == "regular" and attrs.get("sampling_frequency"):
+        return RegularTime(attrs.get("time_start", 0.0), attrs["sampling_frequency"],
+                           attrs["n_samples"])
+    return None
+
+
+class ZarrSignalWriter:
+    """
+    Incremental writer of a "signals" array (and its time axis) into a zarr
+    group: `append` successive (n_channels, n) blocks and `close` when done,
+    so a recording – a streaming reader's output or concatenated segments –
+    is written without ever being held whole.
+
+    Blocks are stored as in `save_standardized_output` (*signal_dtype* and
+    per-channel *scale_factor*/*add_offset*, *zarr_chunks*/*chunk_bytes*,
+    *compression*/*compressor*). The first block fixes the stored dtype and
+    with it the chunk shape. Blocks are buffered up to chunk boundaries, so
+    every chunk is written once. With *n_samples* the array is created at
+    its final length, otherwise it grows; either way it ends at the number
+    of samples appended.
+
+    While blocks follow on from each other the time axis stays implicit;
+    at the first gap (*t0* off the sampling grid, e.g. a new segment) an
+    explicit "time" array is started, back-filled and kept from then on.
+    `close` (also called on leaving a ``with`` block) returns the time
+    metadata as in `_time_layout` and keeps it as ``time_attrs``.
+    """
+
+    def __init__(self, group, n_channels, *, sampling_frequency=None, n_samples=None,
+                 signal_dtype="f8", scale_factor=None, add_offset=None,
+                 zarr_chunks="auto", chunk_bytes=_CHUNK_BYTES, compression=None,
+                 compressor=None, time_encoding="auto"):
+        self.group = group
+        self.n_channels = int(n_channels)
+        self.sampling_frequency = sampling_frequency
+        self.n_samples = n_samples
+        self.time_encoding = time_encoding
+        self._convert, self.scaling = _signal_converter(signal_dtype, scale_factor, add_offset)
+        self._array_options = dict(chunks=zarr_chunks, chunk_bytes=chunk_bytes,
+                                   compression=compression, compressor=compressor)
+        self.signals = None
+        self.time = None
+        self._kwargs = None
+        self._buf, self._tbuf = [], []
+        self._n_buf = 0
+        self._pos = 0                   # samples flushed to the store
+        self._t_start = None
+        self.time_attrs = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+    def _create(self, dtype):
+        kwargs = _signal_array_kwargs(self.n_channels, self.n_samples, dtype, **self._array_options)
+        kwargs["chunks"] = kwargs.get("chunks") or (max(self.n_channels, 1), _STREAM_CHUNK_SAMPLES)
+        self._kwargs = kwargs
+        self.signals = self.group.create_dataset(
+            "signals", shape=(self.n_channels, self.n_samples or 0), dtype=dtype, **kwargs)
+        if self.scaling:
+            self.signals.attrs.update(self.scaling)   # CF-style, for readers of the array alone
+
+    def _start_time(self):
+        """Switch to an explicit time axis, back-filling what came before the gap."""
+        fs = self.sampling_frequency
+        self.time = self.group.create_dataset(
+            "time", shape=(self.signals.shape[1],), dtype="f8",
+            **_time_kwargs(self.signals, self._kwargs))
+        step = self.signals.chunks[1]
+        for i in range(0, self._pos, step):
+            stop = min(self._pos, i + step)
+            self.time[i:stop] = self._t_start + np.arange(i, stop) / fs
+        if self._n_buf:
+            self._tbuf = [self._t_start + np.arange(self._pos, self._pos + self._n_buf) / fs]
+
+    def append(self, block, t0=None):
+        """
+        Add a (n_channels, n) block; *t0* is the time of its first sample
+        (default: right after the previous block).
+        """
+        block = self._convert(block)
+        if block.ndim != 2 or block.shape[0] != self.n_channels:
+            raise ValueError(f"Block of shape {block.shape} does not match "
+                             f"{self.n_channels} channel(s)")
+        if self.signals is None:
+            self._create(block.dtype)
+
+        fs = self.sampling_frequency
+        if fs:
+            expected = (self._t_start or 0.0) + (self._pos + self._n_buf) / fs
+            t0 = expected if t0 is None else float(t0)
+            if self._t_start is None:
+                self._t_start = expected = t0
+            if self.time is None and (self.time_encoding == "explicit"
+                                      or abs(t0 - expected) * fs > _TIME_TOLERANCE):
+                self._start_time()
+            if self.time is not None:
+                self._tbuf.append(t0 + np.arange(block.shape[1]) / fs)
+
+        self._buf.append(block)
+        self._n_buf += block.shape[1]
+        if self._n_buf >= self.signals.chunks[1]:
+            self._flush()
+
+    def extend(self, blocks):
+        """Append every ``(t0, block)`` of *blocks* (e.g. a `SignalBlocks`)."""
+        for t0, block in blocks:
+            self.append(block, t0)
+
+    def _flush(self, final=False):
+        step = self.signals.chunks[1]
+        n = self._n_buf if final else self._n_buf // step * step
+        if not n:
+            return
+        data = np.concatenate(self._buf, axis=1) if len(self._buf) > 1 else self._buf[0]
+        stop = self._pos + n
+        if stop > self.signals.shape[1]:
+            self.signals.resize(self.n_channels, stop)
+        self.signals[:, self._pos:stop] = data[:, :n]
+        self._buf = [data[:, n:]] if n < data.shape[1] else []
+        if self.time is not None:
+            tdata = np.concatenate(self._tbuf)
+            if stop > self.time.shape[0]:
+                self.time.resize(stop)
+            self.time[self._pos:stop] = tdata[:n]
+            self._tbuf = [tdata[n:]] if n < tdata.shape[0] else []
+        self._n_buf -= n
+        self._pos = stop
+
+    def close(self):
+        """Write what is buffered, trim the arrays to the samples appended and return the time metadata."""
+        if self.signals is None:         # no samples at all
+            self._create(self._convert(np.empty((self.n_channels, 0))).dtype)
+        self._flush(final=True)
+        if self.signals.shape[1] != self._pos:
+            self.signals.resize(self.n_channels, self._pos)
+        if self.time is not None and self.time.shape[0] != self._pos:
+            self.time.resize(self._pos)
+
+        if not self.sampling_frequency:
+            self.time_attrs = {}
+        elif self.time is not None:
+            self.time_attrs = {"time_encoding": "explicit"}
+        else:
+            self.time_attrs = {"time_encoding": "regular", "time_start": self._t_start or 0.0,
+                               "n_samples": self._pos}
+        return self.time_attrs
+
+
+def _write_stream(group, stream, options):
+    """Write one further signal stream (see `SignalBlocks`) into its own group."""
+    signals = stream.get("signals")
+    samp_freq = stream.get("sampling_frequency")
+    options = dict(options, scale_factor=stream.get("scale_factor"),
+                   add_offset=stream.get("add_offset"))
+    if isinstance(signals, SignalBlocks):
+        writer = ZarrSignalWriter(group, signals.n_channels, sampling_frequency=samp_freq,
+                                  n_samples=signals.n_samples, **options)
+        writer.extend(signals)
+        time_attrs = writer.close()
+    else:
+        convert, scaling = _signal_converter(options["signal_dtype"], options["scale_factor"],
+                                             options["add_offset"])
+        signals = convert(signals)
+        time, time_attrs = _time_layout(stream.get("time"), samp_freq, signals.shape[-1],
+                                        options["time_encoding"])
+        kwargs = _signal_array_kwargs(*signals.shape, signals.dtype, chunks=options["zarr_chunks"],
+                                      chunk_bytes=options["chunk_bytes"],
+                                      compression=options["compression"],
+                                      compressor=options["compressor"])
+        sig = group.array("signals", signals, **kwargs)
+        if scaling:
+            sig.attrs.update(scaling)
+        if time is not None:
+            group.array("time", time, **_time_kwargs(sig, kwargs))
+    group.attrs.update(
+        time_attrs,
+        sampling_frequency=samp_freq,
+        channel_names=list(stream.get("channel_names") or []),
+        channel_units=list(stream.get("channel_units") or []),
+    )
+
+
+class _ZipMetadataBuffer(MutableMapping):
+    """
+    Zarr store over a `ZipStore`, whose members cannot be replaced: the
+    metadata keys (``.zgroup``, ``.zarray``, ``.zattrs``) – rewritten as
+    arrays grow and attributes are set – are kept here and written once by
+    `flush`; chunks, which the writers produce once each, go straight to the zip.
+    """
+
+    _METADATA_KEYS = (".zgroup", ".zarray", ".zattrs")
+
+    def __init__(self, store):
+        self.store = store
+        self.pending = {}
+
+    def _is_metadata(self, key):
+        return key.rsplit("/", 1)[-1] in self._METADATA_KEYS
+
+    def __getitem__(self, key):
+        if key in self.pending:
+            return self.pending[key]
+        return self.store[key]
+
+    def __setitem__(self, key, value):
+        if self._is_metadata(key):
+            self.pending[key] = value
+        else:
+            self.store[key] = value
+
+    def __delitem__(self, key):
+        if key in self.pending:
+            del self.pending[key]
+        elif key in self.store:
+            del self.store[key]          # NotImplementedError: zip members stay
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.pending or key in self.store
+
+    def __iter__(self):
+        yield from self.pending
+        yield from (k for k in self.store if k not in self.pending)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def flush(self):
+        """Write the final metadata into the zip."""
+        for key, value in self.pending.items():
+            self.store[key] = value
+        self.pending.clear()
+
+
 def save_standardized_output(
     output_path,
     result_dict,
@@ -260,12 +1677,47 @@ def save_standardized_output(
     annotations=None,
     metadata_overrides=None,
     file_format: str = "npz",          # "npz" | "zarr" | "zarr.zip"
-    zarr_chunks=None,                  # e.g. (n_channels, 1024)
-    zarr_compressor=None,              # e.g. zarr.Blosc(...)
+    zarr_chunks="auto",                # "auto", None (zarr's default) or e.g. (n_channels, 1024)
+    zarr_compressor=None,              # e.g. zarr.Blosc(...), overrides compression
+    signal_dtype="f8",                 # numpy dtype, or "native"
+    time_encoding="auto",              # "auto" | "explicit"
+    chunk_bytes=_CHUNK_BYTES,          # target chunk size for zarr_chunks="auto"
+    compression=None,                  # e.g. "zstd:5:bitshuffle+delta", "lz4", "none"
 ):
     """
     Save *result_dict* (time, signals, annotations) in a standardized container.
 
+    *signals* may be a `SignalBlocks` from a streaming descriptor: zarr
+    containers then receive it block by block through a `ZarrSignalWriter`
+    (time is rebuilt from each block's start and the sampling frequency),
+    other containers read it into memory first.
+
+    With *time_encoding* "auto" a regularly sampled time axis of a zarr
+    container is not written out: the metadata records ``time_encoding="regular"`` with
+    ``time_start``, ``sampling_frequency`` and ``n_samples`` instead (see
+    `open_time`). Irregular or segmented time – and every time axis with
+    "explicit" – is stored as a "time" array (``time_encoding="explicit"``).
+    npz and mat containers always hold the explicit time array (built from
+    the sampling frequency when the result has none).
+
+    *signal_dtype* is the stored sample type; "native" keeps the signals'
+    own. Results holding raw samples with per-channel ``scale_factor`` /
+    ``add_offset`` are stored raw for "native" and integer dtypes – the
+    scaling is then recorded (on the zarr ``signals`` array and in the
+    metadata) and applied on read, see `open_signals` – and in physical
+    units for float dtypes. Float signals without a scale cannot be stored
+    under an integer dtype (ValueError). Further streams in ``result_dict["streams"]`` go to
+    ``streams/<name>`` groups of zarr containers; other containers keep only
+    the primary stream.
+
+    *zarr_chunks* "auto" picks time-major chunks of about *chunk_bytes*
+    (see `_signal_chunks`) for the signals and every further stream; the
+    policy and resulting shape are recorded in the metadata as ``chunking``.
+
+    *compression* selects the zarr codec (see `_zarr_codecs`; None keeps
+    zarr's default) and is recorded as ``compression``. npz containers only
+    distinguish "none" (``np.savez``) from anything else (zlib).
+
     Supported containers
     --------------------
     • "npz"       → <output_path>.npz
@@ -273,12 +1725,41 @@ def save_standardized_output(
     • "zarr.zip"  → <output_path>.zarr.zip   (single-file store)
     """
     now = datetime.now().strftime("%Y-%m-%d")
+    _zarr_codecs(compression, "i2")     # reject a bad spec before anything is written
 
     time        = result_dict.get("time")
     signals     = result_dict.get("signals", [])
     metadata_in = result_dict.get("metadata", {})
     samp_freq   = result_dict.get("sampling_frequency")
 
+    streams     = result_dict.get("streams") or {}
+
+    convert, scaling = _signal_converter(signal_dtype, result_dict.get("scale_factor"),
+                                         result_dict.get("add_offset"))
+
+    streamed = isinstance(signals, SignalBlocks)
+    if file_format not in ("zarr", "zarr.zip"):
+        # only zarr is written block by block, and only zarr has room for more streams
+        if streamed:
+            time, signals = signals.materialize(samp_freq)
+            streamed = False
+        if streams:
+            print(f"[INFO] {file_format} output keeps only the primary stream; "
+                  f"skipping {', '.join(streams)}")
+    time_auto_generated = time is None and not (streamed and samp_freq)
+    time_attrs = {}
+    if not streamed:
+        signals = convert(signals)
+        if file_format in ("zarr", "zarr.zip"):
+            time, time_attrs = _time_layout(time, samp_freq,
+                                            signals.shape[-1] if signals.ndim else 0, time_encoding)
+        else:
+            # npz/mat readers index data["time"] directly – always explicit
+            if time is None and samp_freq and signals.ndim:
+                time = np.arange(signals.shape[-1]) / samp_freq
+            if time is not None:
+                time, time_attrs = np.asarray(time, dtype="f8"), {"time_encoding": "explicit"}
+
     channel_names = result_dict.get(
         "channel_names", [f"CH{i+1}" for i in range(len(signals))]
     )
@@ -286,7 +1767,7 @@ def save_standardized_output(
     # ------------ build final metadata ------------------------------------
     meta = {
         "time_units": "seconds",
-        "time_auto_generated": time is None,
+        "time_auto_generated": time_auto_generated,
         "source_format": descriptor.get("format", "unknown"),
         "database_id": "unknown",
         "sampling_frequency": samp_freq,
@@ -307,6 +1788,14 @@ def save_standardized_output(
         "sweep_mode": metadata_in.get("sweep_mode", False),
         "notes": "Mapped using SPARCFUSE",
     }
+    meta.update(scaling)
+    meta.update(time_attrs)
+    if not streamed:
+        meta["signal_dtype"] = str(signals.dtype)
+    if result_dict.get("stream_name"):
+        meta["stream_name"] = result_dict["stream_name"]
+    if streams and file_format in ("zarr", "zarr.zip"):
+        meta["streams"] = list(streams)
     if metadata_overrides:
         meta.update(metadata_overrides)
 
@@ -316,10 +1805,11 @@ def save_standardized_output(
     # 1. NPZ container
     # ======================================================================
     if file_format == "npz":
-        np.savez_compressed(
+        save_npz = np.savez if compression == "none" else np.savez_compressed
+        save_npz(
             output_path.with_suffix(".npz"),
-            time=np.asarray(time, dtype="f8") if time is not None else None,
-            signals=np.asarray(signals, dtype="f8"),
+            time=time,
+            signals=signals,
             annotations=np.asarray(annotations or [], dtype=object),
             metadata=meta,
         )
@@ -335,24 +1825,59 @@ def save_standardized_output(
         store = (
             DirectoryStore(str(store_path))
             if file_format == "zarr"
-            else ZipStore(str(store_path), mode="w")
+            else _ZipMetadataBuffer(ZipStore(str(store_path), mode="w"))
         )
 
         try:
             root = zarr.open_group(store=store, mode="w")
 
-            # ---- time ----------------------------------------------------
-            if time is not None:
-                root.array("time", np.asarray(time, dtype="f8"))
-
             # ---- signals -------------------------------------------------
-            sig_kwargs = {}
-            if zarr_chunks is not None:
-                sig_kwargs["chunks"] = zarr_chunks
-            if zarr_compressor is not None:
-                sig_kwargs["compressor"] = zarr_compressor
-
-            root.array("signals", np.asarray(signals, dtype="f8"), **sig_kwargs)
+            writer_options = dict(signal_dtype=signal_dtype, zarr_chunks=zarr_chunks,
+                                  chunk_bytes=chunk_bytes, compression=compression,
+                                  compressor=zarr_compressor, time_encoding=time_encoding)
+            if streamed:
+                writer = ZarrSignalWriter(root, signals.n_channels, sampling_frequency=samp_freq,
+                                          n_samples=signals.n_samples,
+                                          scale_factor=result_dict.get("scale_factor"),
+                                          add_offset=result_dict.get("add_offset"),
+                                          **writer_options)
+                writer.extend(signals)
+                meta.update(writer.close())       # scaling is set on the array by the writer
+                sig = writer.signals
+                meta["signal_dtype"] = str(sig.dtype)
+            else:
+                n_ch, n_t = signals.shape if signals.ndim == 2 else (0, 0)
+                kwargs = _signal_array_kwargs(
+                    n_ch, n_t, signals.dtype, chunks=zarr_chunks if signals.ndim == 2 else None,
+                    chunk_bytes=chunk_bytes, compression=compression, compressor=zarr_compressor)
+                sig = root.array("signals", signals, **kwargs)
+                if scaling:
+                    sig.attrs.update(scaling)   # CF-style, for readers of the array alone
+
+                # ---- time (only if not regular) ----------------------------
+                if time is not None:
+                    root.array("time", time, **_time_kwargs(sig, kwargs))
+
+            meta["chunking"] = {
+                "policy": ("auto" if isinstance(zarr_chunks, str) and zarr_chunks == "auto"
+                           else "zarr-default" if zarr_chunks is None else "explicit"),
+                "target_bytes": int(chunk_bytes),
+                "signals": list(sig.chunks),
+            }
+            meta["compression"] = {
+                "spec": "custom" if zarr_compressor is not None else (compression or "default"),
+                "compressor": sig.compressor.get_config() if sig.compressor else None,
+                "filters": [f.get_config() for f in sig.filters or []],
+            }
+
+            # ---- further signal streams ----------------------------------
+            if streams:
+                # explicit chunks are sized for the primary stream's channels
+                stream_options = dict(writer_options,
+                                      zarr_chunks=None if zarr_chunks is None else "auto")
+                grp = root.create_group("streams")
+                for name, stream in streams.items():
+                    _write_stream(grp.create_group(name), stream, stream_options)
 
             # ---- annotations --------------------------------------------
             if annotations:
@@ -367,15 +1892,16 @@ def save_standardized_output(
             root.attrs.update(meta)
 
         finally:
-            if isinstance(store, ZipStore):
-                store.close()
+            if isinstance(store, _ZipMetadataBuffer):
+                store.flush()
+                store.store.close()
 
         return
 
     elif file_format == "mat":
         mat_dict = {
-            "time": np.asarray(time, dtype="f8") if time is not None else np.empty(0),
-            "signals": np.asarray(signals, dtype="f8"),
+            "time": time if time is not None else np.empty(0),
+            "signals": signals,
             "annotations": np.asarray(annotations or [], dtype=object),
             "metadata": meta,
         }
@@ -420,8 +1946,9 @@ def load_and_plot_zarr(zarr_path_str: str | Path) -> None:
 
     try:
         # ── 2. pull arrays ──────────────────────────────────────────────
-        time    = root["time"][:]                 # (n_time,)
-        signals = root["signals"][:]              # (n_chan, n_time)
+        signals = open_signals(root)[:]           # (n_chan, n_time), scaled if stored raw
+        time    = open_time(root)                 # (n_time,), rebuilt if regular
+        time    = np.arange(signals.shape[1]) if time is None else np.asarray(time[:])
         metadata = dict(root.attrs)
         chan_names = metadata.get(
             "channel_names", [f"CH{i+1}" for i in range(signals.shape[0])]